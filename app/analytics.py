@@ -0,0 +1,352 @@
+"""
+Admin dashboard rollups.
+
+analytics_rollups holds one row per (metric, key):
+
+    users_by_role        key=role          value=users
+    jobs_by_company      key=company id    value=jobs          label=company name
+    applications_by_job  key=job id        value=applications  label=job title
+    match_score          key=sum / count   value=running totals of scored applications
+
+Session events turn every flushed insert/update/delete of a User, Company,
+Job or Application into deltas applied in the same transaction, so the
+dashboard reads a single small table. rebuild_rollups() recomputes it
+from scratch (flask rebuild-rollups). Skill counts are a GROUP BY over the
+indexed application_skills table (top_skills()).
+"""
+from sqlalchemy import delete, event, func, inspect, select, update
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import AnalyticsRollup, User, Company, Job, Application, JobCategory, application_skills
+
+
+ROLES = ["admin", "business", "employee", "job_seeker", "suspended"]
+
+_rollups = AnalyticsRollup.__table__
+
+_TRACKED = {
+    User: ("user_type",),
+    Company: ("name",),
+    Job: ("company_id", "title"),
+    Application: ("job_id", "match_score"),
+}
+
+
+# ===============================
+# CONTRIBUTIONS
+# ===============================
+def _contributions(obj, value):
+    """
+    Rows one object adds to the rollups: [(metric, key, delta, label)].
+    value(attr) reads the attribute in the state being counted.
+    """
+    if isinstance(obj, User):
+        return [("users_by_role", value("user_type"), 1, None)]
+
+    if isinstance(obj, Company):
+        return [("jobs_by_company", str(obj.id), 0, value("name"))]
+
+    if isinstance(obj, Job):
+        return [
+            ("jobs_by_company", str(value("company_id")), 1, None),
+            ("applications_by_job", str(obj.id), 0, value("title")),
+        ]
+
+    if isinstance(obj, Application):
+        rows = [("applications_by_job", str(value("job_id")), 1, None)]
+        score = value("match_score")
+        if score is not None:
+            rows += [("match_score", "sum", score, None), ("match_score", "count", 1, None)]
+        return rows
+
+    return []
+
+
+def _committed_value(session, obj, attr):
+    """
+    The attribute as the database holds it before this flush
+    """
+    history = inspect(obj).attrs[attr].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    if not history.added:
+        return getattr(obj, attr)
+
+    # Set without loading the old value (expired attribute): read the row
+    model = type(obj)
+    return session.execute(
+        select(getattr(model, attr)).where(model.id == obj.id)
+    ).scalar()
+
+
+class _Deltas:
+    def __init__(self):
+        self.values = {}
+        self.labels = {}
+        self.dropped = set()
+
+    def add(self, rows, sign=1):
+        for metric, key, delta, label in rows:
+            if key in (None, "None"):
+                continue
+            row = (metric, key)
+            self.values[row] = self.values.get(row, 0) + sign * delta
+            if label is not None and sign > 0:
+                self.labels[row] = label
+
+    def drop(self, metric, key):
+        self.dropped.add((metric, str(key)))
+
+
+# ===============================
+# FLUSH HOOKS
+# ===============================
+@event.listens_for(Session, "before_flush")
+def _collect_removed(session, flush_context, instances):
+    """
+    Deleted and updated rows: take back what their old state contributed
+    (the old values are still readable here)
+    """
+    deltas = _Deltas()
+
+    for obj in session.deleted:
+        if type(obj) not in _TRACKED:
+            continue
+        deltas.add(_contributions(obj, lambda a: _committed_value(session, obj, a)), sign=-1)
+        if isinstance(obj, Company):
+            deltas.drop("jobs_by_company", obj.id)
+        elif isinstance(obj, Job):
+            deltas.drop("applications_by_job", obj.id)
+
+    for obj in session.dirty:
+        attrs = _TRACKED.get(type(obj))
+        if not attrs or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[a].history.has_changes() for a in attrs):
+            continue
+        deltas.add(_contributions(obj, lambda a: _committed_value(session, obj, a)), sign=-1)
+        deltas.add(_contributions(obj, lambda a: getattr(obj, a)))
+
+    session.info["rollup_deltas"] = deltas
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_deltas(session, flush_context):
+    """
+    New rows (which have their ids by now), then write everything
+    """
+    deltas = session.info.pop("rollup_deltas", None) or _Deltas()
+
+    for obj in session.new:
+        if type(obj) in _TRACKED:
+            deltas.add(_contributions(obj, lambda a: getattr(obj, a)))
+
+    conn = session.connection()
+    for (metric, key), delta in deltas.values.items():
+        label = deltas.labels.get((metric, key))
+        if delta or label is not None:
+            _bump(conn, metric, key, delta, label)
+
+    for metric, key in deltas.dropped:
+        conn.execute(delete(_rollups).where(_rollups.c.metric == metric, _rollups.c.key == key))
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_deltas(session):
+    session.info.pop("rollup_deltas", None)
+
+
+def _bump(conn, metric, key, delta, label=None):
+    """
+    value += delta (and label = label, when given), creating the row if needed
+    """
+    dialect = conn.dialect.name
+    row = {"metric": metric, "key": key, "label": label, "value": delta}
+
+    if dialect == "sqlite":
+        stmt = sqlite.insert(_rollups).values(**row)
+        changes = {"value": _rollups.c.value + stmt.excluded.value}
+        if label is not None:
+            changes["label"] = stmt.excluded.label
+        conn.execute(stmt.on_conflict_do_update(index_elements=["metric", "key"], set_=changes))
+    elif dialect in ("mysql", "mariadb"):
+        stmt = mysql.insert(_rollups).values(**row)
+        changes = {"value": _rollups.c.value + stmt.inserted.value}
+        if label is not None:
+            changes["label"] = stmt.inserted.label
+        conn.execute(stmt.on_duplicate_key_update(**changes))
+    else:
+        changes = {"value": _rollups.c.value + delta}
+        if label is not None:
+            changes["label"] = label
+        updated = conn.execute(
+            update(_rollups)
+            .where(_rollups.c.metric == metric, _rollups.c.key == key)
+            .values(**changes)
+        )
+        if not updated.rowcount:
+            conn.execute(_rollups.insert().values(**row))
+
+
+def record_score_change(conn, delta):
+    """
+    Rollup delta for match scores rewritten through Core (rescore-applications)
+    """
+    if delta:
+        _bump(conn, "match_score", "sum", delta)
+
+
+def record_jobs(conn, jobs):
+    """
+    Rollup deltas for jobs inserted through Core (bulk import), which
+    the flush hooks never see. jobs: [(job_id, company_id, title)]
+    """
+    if not jobs:
+        return
+
+    # New job ids: their rows can't exist yet
+    conn.execute(_rollups.insert(), [
+        {"metric": "applications_by_job", "key": str(job_id), "label": title, "value": 0}
+        for job_id, _, title in jobs
+    ])
+
+    per_company = {}
+    for _, company_id, _ in jobs:
+        per_company[company_id] = per_company.get(company_id, 0) + 1
+    for company_id, count in per_company.items():
+        _bump(conn, "jobs_by_company", str(company_id), count)
+
+
+# ===============================
+# READ (admin dashboard)
+# ===============================
+def load_rollups():
+    """
+    Returns {metric: [(key, label, value)]} in one query
+    """
+    metrics = {}
+    for row in AnalyticsRollup.query.all():
+        metrics.setdefault(row.metric, []).append((row.key, row.label, row.value))
+    return metrics
+
+
+def _by_id(rows):
+    return sorted(rows, key=lambda row: int(row[0]))
+
+
+def top_skills(limit=None):
+    """
+    [(skill, applications)] most common first, from application_skills
+    """
+    applicants = func.count(application_skills.c.application_id)
+    query = (
+        db.session.query(JobCategory.name, applicants)
+        .join(application_skills, application_skills.c.category_id == JobCategory.id)
+        .group_by(JobCategory.id, JobCategory.name)
+        .order_by(applicants.desc(), JobCategory.name)
+    )
+    if limit:
+        query = query.limit(limit)
+    return query.all()
+
+
+def dashboard_stats():
+    metrics = load_rollups()
+
+    role_counts = {key: int(value) for key, _, value in metrics.get("users_by_role", [])}
+    for role in ROLES:
+        role_counts.setdefault(role, 0)
+
+    companies = _by_id(metrics.get("jobs_by_company", []))
+    jobs = _by_id(metrics.get("applications_by_job", []))
+
+    score = {key: value for key, _, value in metrics.get("match_score", [])}
+    scored = score.get("count", 0)
+
+    return {
+        "role_counts": role_counts,
+        "company_names": [label for _, label, _ in companies],
+        "job_counts": [int(value) for _, _, value in companies],
+        "job_titles": [label for _, label, _ in jobs],
+        "apps_per_job": [int(value) for _, _, value in jobs],
+        "total_users": sum(role_counts.values()),
+        "total_jobs": sum(int(value) for _, _, value in companies),
+        "total_applications": sum(int(value) for _, _, value in jobs),
+        "avg_match_score": round(score.get("sum", 0) / scored, 2) if scored else 0,
+        "skill_count": dict(top_skills()),
+    }
+
+
+# ===============================
+# REBUILD (from the source tables)
+# ===============================
+def compute_rollups(conn):
+    """
+    Returns {(metric, key): (label, value)} computed from scratch
+    """
+    rows = {}
+
+    for role, count in conn.execute(
+        select(User.user_type, func.count(User.id)).group_by(User.user_type)
+    ):
+        rows[("users_by_role", role)] = (None, count)
+
+    for company_id, name, count in conn.execute(
+        select(Company.id, Company.name, func.count(Job.id))
+        .outerjoin(Job, Job.company_id == Company.id)
+        .group_by(Company.id, Company.name)
+    ):
+        rows[("jobs_by_company", str(company_id))] = (name, count)
+
+    for job_id, title, count in conn.execute(
+        select(Job.id, Job.title, func.count(Application.id))
+        .outerjoin(Application, Application.job_id == Job.id)
+        .group_by(Job.id, Job.title)
+    ):
+        rows[("applications_by_job", str(job_id))] = (title, count)
+
+    total, scored = conn.execute(
+        select(func.sum(Application.match_score), func.count(Application.match_score))
+    ).one()
+    rows[("match_score", "sum")] = (None, total or 0)
+    rows[("match_score", "count")] = (None, scored)
+
+    return rows
+
+
+def write_rollups(conn, rows):
+    conn.execute(delete(_rollups))
+    if rows:
+        conn.execute(_rollups.insert(), [
+            {"metric": metric, "key": key, "label": label, "value": value}
+            for (metric, key), (label, value) in rows.items()
+        ])
+
+
+def rebuild_rollups():
+    """
+    Recomputes every rollup; returns [(metric, key, stored, recomputed)]
+    for the rows that had drifted
+    """
+    conn = db.session.connection()
+    fresh = compute_rollups(conn)
+    stored = {
+        (row.metric, row.key): row.value
+        for row in conn.execute(select(_rollups.c.metric, _rollups.c.key, _rollups.c.value))
+    }
+
+    drift = []
+    for row in sorted(set(fresh) | set(stored)):
+        old = stored.get(row, 0)
+        new = fresh.get(row, (None, 0))[1]
+        if abs(old - new) > 1e-6:
+            drift.append((*row, old, new))
+
+    write_rollups(conn, fresh)
+    db.session.commit()
+    return drift
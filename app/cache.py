@@ -0,0 +1,324 @@
+"""
+Response cache for pages that are the same for every visitor of a role.
+
+Entries carry an explicit TTL and are keyed by the current version of the
+data namespaces they depend on ("jobs", "companies", ...). Committing a
+change to a model bumps its namespace, so old entries are never read
+again and simply age out.
+
+Backends (CACHE_BACKEND):
+    memory  in-process LRU (default); each worker has its own
+    sqlite  a local SQLite file (CACHE_PATH) shared by all workers
+            on the host, versions included
+    null    disabled
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import request, session, make_response, current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import User, Company, Job, Application, JobCategory, SimilarJob
+
+
+# ===============================
+# BACKENDS
+# ===============================
+class NullBackend:
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def versions(self, names):
+        return [0] * len(names)
+
+    def bump(self, name):
+        return 0
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+class MemoryBackend:
+    """
+    LRU dict with per-entry expiry. Versions are kept apart so eviction
+    can never roll a namespace back.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def versions(self, names):
+        with self._lock:
+            return [self._versions.get(name, 0) for name in names]
+
+    def bump(self, name):
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+            return self._versions[name]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    Cache file shared by the worker processes of one host
+    """
+
+    PURGE_EVERY = 500   # sets between sweeps of expired rows
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._sets = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, expires REAL NOT NULL, value BLOB NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS versions "
+                "(name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._conn().execute(
+            "SELECT expires, value FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        return pickle.loads(row[1])
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, expires, value) VALUES (?, ?, ?)",
+                (key, now + ttl, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)),
+            )
+            self._sets += 1
+            if self._sets % self.PURGE_EVERY == 0:
+                conn.execute("DELETE FROM entries WHERE expires < ?", (now,))
+
+    def versions(self, names):
+        if not names:
+            return []
+        rows = dict(self._conn().execute(
+            f"SELECT name, version FROM versions WHERE name IN ({','.join('?' * len(names))})",
+            list(names),
+        ).fetchall())
+        return [rows.get(name, 0) for name in names]
+
+    def bump(self, name):
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO versions (name, version) VALUES (?, 1) "
+                "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+                (name,),
+            )
+            return conn.execute("SELECT version FROM versions WHERE name = ?", (name,)).fetchone()[0]
+
+    def clear(self):
+        with self._conn() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def __len__(self):
+        return self._conn().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+# ===============================
+# CACHE
+# ===============================
+class Cache:
+    def __init__(self):
+        self.backend = NullBackend()
+        self.default_ttl = 60
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("CACHE_BACKEND", os.getenv("CACHE_BACKEND", "memory"))
+        app.config.setdefault("CACHE_PATH", os.getenv("CACHE_PATH", "cache/responses.sqlite3"))
+        app.config.setdefault("CACHE_MAX_ENTRIES", int(os.getenv("CACHE_MAX_ENTRIES", 1024)))
+        app.config.setdefault("CACHE_TTL", int(os.getenv("CACHE_TTL", 60)))
+
+        kind = app.config["CACHE_BACKEND"]
+        if kind == "memory":
+            self.backend = MemoryBackend(app.config["CACHE_MAX_ENTRIES"])
+        elif kind == "sqlite":
+            self.backend = SQLiteBackend(app.config["CACHE_PATH"])
+        elif kind in ("null", "none", ""):
+            self.backend = NullBackend()
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND {kind!r}")
+
+        self.default_ttl = app.config["CACHE_TTL"]
+        app.extensions["cache"] = self
+
+    @property
+    def enabled(self):
+        return not isinstance(self.backend, NullBackend)
+
+    def versions(self, namespaces):
+        return self.backend.versions(list(namespaces))
+
+    def bump(self, *namespaces):
+        for name in namespaces:
+            self.backend.bump(name)
+
+    def record(self, name, outcome):
+        with self._lock:
+            counters = self._stats.setdefault(name, {"hits": 0, "misses": 0, "skips": 0})
+            counters[outcome] += 1
+
+    def stats(self):
+        """
+        Per-view hit/miss counters of this process, plus the backend size
+        """
+        with self._lock:
+            views = {name: dict(counters) for name, counters in self._stats.items()}
+
+        for counters in views.values():
+            lookups = counters["hits"] + counters["misses"]
+            counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else None
+
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "views": views,
+        }
+
+
+cache = Cache()
+
+
+# ===============================
+# VIEW DECORATOR
+# ===============================
+def cached_view(depends_on, ttl=None, vary=("user_type",)):
+    """
+    Caches a GET view's 200 responses.
+
+    depends_on: namespaces whose commits invalidate the page
+    vary:       session keys the page differs by, or a callable
+                returning the varying values
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            name = request.endpoint
+
+            # Pending flashes are rendered into the page: never serve or store
+            if not cache.enabled or request.method != "GET" or session.get("_flashes"):
+                cache.record(name, "skips")
+                return view(*args, **kwargs)
+
+            varying = vary() if callable(vary) else [session.get(k) for k in vary]
+            raw = repr((request.full_path, varying, cache.versions(depends_on)))
+            key = f"{name}:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+            hit = cache.backend.get(key)
+            if hit is not None:
+                cache.record(name, "hits")
+                body, status, mimetype = hit
+                return current_app.response_class(body, status=status, mimetype=mimetype)
+
+            cache.record(name, "misses")
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.direct_passthrough:
+                cache.backend.set(
+                    key,
+                    (response.get_data(), response.status_code, response.mimetype),
+                    ttl or cache.default_ttl,
+                )
+            return response
+        return wrapped
+    return decorator
+
+
+# ===============================
+# INVALIDATION (bump on commit)
+# ===============================
+NAMESPACES = {
+    User: "users",
+    Company: "companies",
+    Job: "jobs",
+    JobCategory: "jobs",
+    SimilarJob: "jobs",
+    Application: "applications",
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_namespaces(session, flush_context):
+    touched = session.info.setdefault("cache_namespaces", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        namespace = NAMESPACES.get(type(obj))
+        if namespace:
+            touched.add(namespace)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_namespaces(session):
+    namespaces = session.info.pop("cache_namespaces", None)
+    if namespaces:
+        try:
+            cache.bump(*namespaces)
+        except sqlite3.Error as e:
+            print("Cache invalidation failed:", e)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_namespaces(session):
+    session.info.pop("cache_namespaces", None)
@@ -0,0 +1,127 @@
+import click
+
+from app import db
+
+
+def register_commands(app):
+    """
+    Maintenance commands, run with `flask --app run <command>`
+    """
+
+    @app.cli.command("rebuild-similar-jobs")
+    def rebuild_similar_jobs_command():
+        """Recompute the precomputed similar-jobs table."""
+        from app.ml.similar_jobs import rebuild_similar_jobs
+
+        written = rebuild_similar_jobs()
+        click.echo(f"Wrote {written} similar-job rows.")
+
+    @app.cli.command("backfill-job-skills")
+    def backfill_job_skills_command():
+        """Extract skills for every job into the job_skills table."""
+        from app.ml.job_skills import backfill_job_skills
+
+        processed = backfill_job_skills()
+        click.echo(f"Extracted skills for {processed} jobs.")
+
+    @app.cli.command("db-upgrade")
+    def db_upgrade_command():
+        """Apply pending schema migrations (app/migrations)."""
+        from app.migrations import upgrade
+
+        applied = upgrade(echo=click.echo)
+        click.echo(f"Applied {len(applied)} migrations." if applied else "Database is up to date.")
+
+    @app.cli.command("check-query-plans")
+    def check_query_plans_command():
+        """EXPLAIN the hot queries and fail if one skips its index."""
+        from app.query_plans import check_query_plans
+
+        failed = 0
+        for result in check_query_plans():
+            status = "ok  " if result["ok"] else "FAIL"
+            used = ", ".join(result["used"]) or "no index"
+            click.echo(f"{status} {result['name']}: {used}")
+            if not result["ok"]:
+                failed += 1
+                for line in result["plan"]:
+                    click.echo(f"       {line}")
+
+        if failed:
+            raise SystemExit(1)
+
+    @app.cli.command("rebuild-rollups")
+    def rebuild_rollups_command():
+        """Recompute analytics_rollups from scratch and report drift."""
+        from app.analytics import rebuild_rollups
+
+        drift = rebuild_rollups()
+        for metric, key, stored, fresh in drift[:50]:
+            click.echo(f"  {metric}[{key}]: {stored:g} -> {fresh:g}")
+        click.echo(f"Rebuilt rollups; {len(drift)} rows had drifted.")
+
+    @app.cli.command("backfill-application-skills")
+    def backfill_application_skills_command():
+        """Fill application_skills from the comma-separated skills column."""
+        from app.ml.job_skills import backfill_application_skills
+
+        processed = backfill_application_skills()
+        click.echo(f"Linked skills for {processed} applications.")
+
+    @app.cli.command("rebuild-user-counters")
+    def rebuild_user_counters_command():
+        """Recompute the per-user application counters."""
+        from app.user_counters import refresh_user_counters
+
+        refresh_user_counters(db.session.connection())
+        db.session.commit()
+        click.echo("User counters rebuilt.")
+
+    @app.cli.command("reindex-search")
+    def reindex_search_command():
+        """Rebuild the job_search and user_search full-text tables."""
+        from app.search import reindex_all
+        from app.user_search import backfill_normalized, reindex_users
+
+        conn = db.session.connection()
+        jobs = reindex_all(conn)
+        backfill_normalized(conn)
+        users = reindex_users(conn)
+        db.session.commit()
+        click.echo(f"Indexed {jobs} jobs and {users} users.")
+
+    @app.cli.command("import-jobs")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--source", help="Feed name (default: the file name).")
+    @click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), help="Default: from the extension.")
+    @click.option("--batch-size", default=1000, show_default=True)
+    @click.option("--restart", is_flag=True, help="Start over instead of resuming this file.")
+    @click.option("--no-similar", is_flag=True, help="Skip the similar-jobs rebuild at the end (run rebuild-similar-jobs later).")
+    def import_jobs_command(path, source, fmt, batch_size, restart, no_similar):
+        """Stream a CSV / JSON Lines job feed into the jobs table (resumable)."""
+        from app.job_import import import_jobs
+
+        job_import = import_jobs(
+            path, source=source, fmt=fmt, batch_size=batch_size,
+            restart=restart, rebuild_similar=not no_similar, echo=click.echo,
+        )
+        if job_import.status != "done":
+            raise SystemExit(1)
+
+    @app.cli.command("rescore-applications")
+    @click.option("--workers", default=2, show_default=True, help="Scoring processes (1 = inline).")
+    @click.option("--chunk-size", default=500, show_default=True)
+    def rescore_applications_command(workers, chunk_size):
+        """Re-score every scored application, e.g. after a model change."""
+        from app.ml.rescoring import rescore_all
+
+        done = rescore_all(workers=workers, chunk_size=chunk_size, echo=click.echo)
+        click.echo(f"Re-scored {done} applications.")
+
+    @app.cli.command("process-profile-photos")
+    def process_profile_photos_command():
+        """Make thumbnails for profile photos uploaded before the image pipeline."""
+        from app.images import convert_legacy_photos
+
+        converted = convert_legacy_photos(echo=click.echo)
+        click.echo(f"Converted {converted} profile photos.")
@@ -0,0 +1,237 @@
+"""
+Profile photo pipeline.
+
+upload_photo only checks the upload's header (format, dimensions) and
+keeps the file outside static/; the "process_profile_photo" background
+task then decodes it, applies its EXIF orientation, drops all metadata
+and writes a square thumbnail per size, as WebP and JPEG:
+
+    app/static/uploads/profile_pics/<key>_<size>.webp / .jpg
+
+User.profile_image holds <key>. Photos uploaded before the pipeline
+hold a file name (with extension) and are served as they are until
+`flask --app run process-profile-photos` converts them.
+
+Templates use the avatar macro (_avatar.html), which asks photo_url()
+for the smallest thumbnail that is sharp at the displayed width.
+"""
+import os
+import time
+import uuid
+
+from flask import url_for
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app import db
+from app.models import User
+from app.tasks import enqueue, task_handler
+
+
+PHOTO_DIR = "app/static/uploads/profile_pics"
+ORIGINALS_DIR = "uploads/profile_originals"     # raw uploads, never served
+DEFAULT_PHOTO = "images/default_profile.png"
+
+# Square edge in pixels; picked for about twice the displayed width (HiDPI)
+THUMBNAIL_SIZES = {"sm": 64, "md": 256}
+FORMATS = {"webp": ("WEBP", {"quality": 80, "method": 6}),
+           "jpg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True})}
+
+ALLOWED_FORMATS = {"JPEG", "PNG"}
+MAX_PIXELS = 40_000_000     # decoded size guard (a 2 MB PNG can inflate to GBs)
+
+os.makedirs(PHOTO_DIR, exist_ok=True)
+os.makedirs(ORIGINALS_DIR, exist_ok=True)
+
+_DECODE_ERRORS = (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError, ValueError)
+
+
+# ===============================
+# PATHS / KEYS
+# ===============================
+def new_photo_key():
+    """
+    Hex upload time + random suffix: keys sort by upload time, so a
+    slow task can't replace a newer photo with an older one
+    """
+    return f"{time.time_ns():016x}{uuid.uuid4().hex[:8]}"
+
+
+def is_processed(name):
+    return bool(name) and "." not in name
+
+
+def original_path(key):
+    return os.path.join(ORIGINALS_DIR, key)
+
+
+def thumbnail_name(key, size, fmt):
+    return f"{key}_{size}.{fmt}"
+
+
+def remove_photo(name):
+    """
+    Deletes a stored photo's files (all thumbnails, or a legacy file)
+    """
+    if not name:
+        return
+    if is_processed(name):
+        paths = [os.path.join(PHOTO_DIR, thumbnail_name(name, size, fmt))
+                 for size in THUMBNAIL_SIZES for fmt in FORMATS]
+    else:
+        paths = [os.path.join(PHOTO_DIR, os.path.basename(name))]
+
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# ===============================
+# VALIDATION (request time)
+# ===============================
+def check_upload(stream):
+    """
+    Reads only the image header. Returns an error message or None.
+    """
+    try:
+        with Image.open(stream) as image:
+            if image.format not in ALLOWED_FORMATS:
+                return "Only JPG, PNG images allowed."
+            width, height = image.size
+            if width * height > MAX_PIXELS:
+                return "Image dimensions are too large."
+            image.verify()
+    except _DECODE_ERRORS:
+        return "The file is not a valid image."
+    finally:
+        stream.seek(0)
+    return None
+
+
+# ===============================
+# THUMBNAILS (background task)
+# ===============================
+def _to_rgb(image):
+    """
+    Flattens transparency onto white: JPEG has no alpha
+    """
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def write_thumbnails(source, key):
+    """
+    Decodes source once and writes every size/format for key
+    """
+    largest = max(THUMBNAIL_SIZES.values())
+
+    with Image.open(source) as image:
+        if image.width * image.height > MAX_PIXELS:
+            raise ValueError(f"{image.width}x{image.height} image is too large")
+
+        # JPEG: let the decoder scale down by 1/2..1/8 while staying >= largest
+        image.draft("RGB", (largest, largest))
+        image = _to_rgb(ImageOps.exif_transpose(image))
+
+    for size, edge in THUMBNAIL_SIZES.items():
+        thumbnail = ImageOps.fit(image, (edge, edge), Image.Resampling.LANCZOS)
+        thumbnail.info = {}     # no EXIF (GPS, camera), ICC or comments
+        for fmt, (pil_format, options) in FORMATS.items():
+            thumbnail.save(os.path.join(PHOTO_DIR, thumbnail_name(key, size, fmt)), pil_format, **options)
+
+
+def _discard_original(user_id, key):
+    try:
+        os.remove(original_path(key))
+    except FileNotFoundError:
+        pass
+
+
+def queue_photo(user, photo):
+    """
+    Stores the uploaded file and queues its processing (commit to start)
+    """
+    key = new_photo_key()
+    photo.save(original_path(key))
+    enqueue("process_profile_photo", user_id=user.id, key=key)
+    return key
+
+
+@task_handler("process_profile_photo", max_attempts=2, on_failure=_discard_original)
+def process_profile_photo(user_id, key):
+    """
+    Makes the thumbnails and switches the user to them
+    """
+    source = original_path(key)
+    user = db.session.get(User, user_id)
+    if not user or not os.path.exists(source):
+        return
+
+    write_thumbnails(source, key)
+
+    previous = user.profile_image
+    if is_processed(previous) and previous > key:
+        # A newer upload finished first
+        remove_photo(key)
+    else:
+        user.profile_image = key
+        db.session.commit()
+        remove_photo(previous)
+
+    _discard_original(user_id, key)
+
+
+def convert_legacy_photos(echo=print):
+    """
+    Thumbnails for photos stored before the pipeline existed. Returns
+    the number converted.
+    """
+    converted = 0
+    users = User.query.filter(User.profile_image.like("%.%")).order_by(User.id).all()
+    for user in users:
+        legacy = user.profile_image
+        source = os.path.join(PHOTO_DIR, os.path.basename(legacy))
+        key = new_photo_key()
+        try:
+            write_thumbnails(source, key)
+        except _DECODE_ERRORS as e:
+            remove_photo(key)
+            echo(f"  user {user.id}: skipped {legacy} ({e})")
+            continue
+
+        user.profile_image = key
+        db.session.commit()
+        remove_photo(legacy)
+        converted += 1
+    return converted
+
+
+# ===============================
+# TEMPLATES
+# ===============================
+def photo_url(user, width, fmt="jpg"):
+    """
+    URL of the smallest thumbnail sharp at `width` CSS pixels. Legacy
+    photos and the default picture exist in one format only: None for
+    any other fmt.
+    """
+    name = user.profile_image
+    if not is_processed(name):
+        if fmt != "jpg":
+            return None
+        filename = f"uploads/profile_pics/{name}" if name else DEFAULT_PHOTO
+        return url_for("static", filename=filename)
+
+    fitting = [size for size, edge in sorted(THUMBNAIL_SIZES.items(), key=lambda item: item[1])
+               if edge >= width * 2]
+    size = fitting[0] if fitting else max(THUMBNAIL_SIZES, key=THUMBNAIL_SIZES.get)
+    return url_for("static", filename=f"uploads/profile_pics/{thumbnail_name(name, size, fmt)}")
+
+
+def init_app(app):
+    app.add_template_global(photo_url)
@@ -0,0 +1,393 @@
+"""
+Bulk job import from partner feeds (CSV or JSON Lines).
+
+    flask --app run import-jobs feeds/acme-2026-10-18.jsonl --source acme
+
+Rows are streamed and handled in batches: one Core INSERT per batch,
+with skill extraction and TF-IDF vectorization run on the whole batch.
+Each batch commits together with its checkpoint row in job_imports, so
+re-running the command on the same file resumes after the last
+committed batch.
+
+Fields: title, description, location, job_type (required), salary_range
+(or salary), external_id, posted_at, and company_id or company (name of
+an existing company; the job is posted by its employer). Rows already
+imported from the same source (same external_id) are skipped.
+"""
+import csv
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from app import db
+from app.models import Job, Company, JobImport, job_skills
+
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_REJECTS = 20
+
+_REQUIRED = ("title", "description", "location", "job_type")
+_LIMITS = {"title": 180, "location": 150, "job_type": 50, "salary_range": 100, "external_id": 120}
+_jobs = Job.__table__
+
+
+# ===============================
+# INPUT
+# ===============================
+def file_fingerprint(path, head_bytes=1 << 20):
+    """
+    Identifies a feed file by its size and first MB, so a resumed run
+    only continues an import of the very same file
+    """
+    digest = hashlib.sha1(str(os.path.getsize(path)).encode())
+    with open(path, "rb") as f:
+        digest.update(f.read(head_bytes))
+    return digest.hexdigest()
+
+
+def _detect_format(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_rows(path, fmt=None):
+    """
+    Yields (position, row dict or None, error) one input record at a time
+    """
+    fmt = _detect_format(path, fmt)
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            for position, row in enumerate(csv.DictReader(f), start=1):
+                yield position, row, None
+            return
+
+        position = 0
+        for line in f:
+            if not line.strip():
+                continue
+            position += 1
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield position, None, f"invalid JSON ({e})"
+                continue
+            if not isinstance(row, dict):
+                yield position, None, "not a JSON object"
+                continue
+            yield position, row, None
+
+
+# ===============================
+# VALIDATION
+# ===============================
+class CompanyResolver:
+    """
+    company_id / company name -> (company id, employer user id), memoized
+    for the whole import
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._by_id = {}
+        self._by_name = {}
+
+    def preload(self, rows):
+        ids = {self._as_int(r.get("company_id")) for r in rows} - set(self._by_id) - {None}
+        names = {self._clean(r.get("company")) for r in rows} - set(self._by_name) - {None}
+
+        if ids:
+            for company_id, user_id in self.conn.execute(
+                sa.select(Company.id, Company.employer_user_id).where(Company.id.in_(ids))
+            ):
+                self._by_id[company_id] = (company_id, user_id)
+            for company_id in ids:
+                self._by_id.setdefault(company_id, None)
+
+        if names:
+            found = {}
+            for company_id, name, user_id in self.conn.execute(
+                sa.select(Company.id, Company.name, Company.employer_user_id)
+                .where(Company.name.in_(names))
+            ):
+                found.setdefault(name, []).append((company_id, user_id))
+            for name in names:
+                matches = found.get(name, [])
+                # Names aren't unique: refuse to guess
+                self._by_name[name] = matches[0] if len(matches) == 1 else len(matches)
+
+    def resolve(self, row):
+        """
+        Returns ((company id, employer id), None) or (None, reason)
+        """
+        company_id = self._as_int(row.get("company_id"))
+        if company_id is not None:
+            company = self._by_id.get(company_id)
+            return (company, None) if company else (None, f"unknown company_id {company_id}")
+
+        name = self._clean(row.get("company"))
+        if name is None:
+            return None, "missing company_id / company"
+        company = self._by_name.get(name)
+        if isinstance(company, tuple):
+            return company, None
+        if company:
+            return None, f"ambiguous company name {name!r}"
+        return None, f"unknown company {name!r}"
+
+    @staticmethod
+    def _as_int(value):
+        try:
+            return int(value) if value not in (None, "") else None
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _clean(value):
+        value = str(value).strip() if value is not None else ""
+        return value or None
+
+
+def _parse_posted_at(value):
+    if not value:
+        return datetime.utcnow()
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def validate_row(row, companies, source, default_external_id):
+    """
+    Returns (values for the jobs table, None) or (None, reason)
+    """
+    values = {}
+    for field in ("title", "description", "location", "job_type", "external_id"):
+        value = row.get(field)
+        values[field] = str(value).strip() if value not in (None, "") else None
+    salary = row.get("salary_range", row.get("salary"))
+    values["salary_range"] = str(salary).strip() if salary not in (None, "") else None
+
+    missing = [field for field in _REQUIRED if not values[field]]
+    if missing:
+        return None, "missing " + ", ".join(missing)
+
+    for field, limit in _LIMITS.items():
+        if values[field] and len(values[field]) > limit:
+            return None, f"{field} longer than {limit} characters"
+
+    company, reason = companies.resolve(row)
+    if reason:
+        return None, reason
+
+    try:
+        posted_at = _parse_posted_at(row.get("posted_at"))
+    except ValueError:
+        return None, f"invalid posted_at {row.get('posted_at')!r}"
+
+    values.update(
+        source=source,
+        external_id=values["external_id"] or default_external_id,
+        company_id=company[0],
+        posted_by_user_id=company[1],
+        posted_at=posted_at,
+    )
+    return values, None
+
+
+# ===============================
+# BATCH
+# ===============================
+def _existing_external_ids(conn, source, external_ids):
+    return {
+        row[0] for row in conn.execute(
+            sa.select(Job.external_id)
+            .where(Job.source == source, Job.external_id.in_(list(external_ids)))
+        )
+    }
+
+
+def insert_batch(conn, source, rows):
+    """
+    Inserts validated rows and everything derived from them, in the
+    caller's transaction. Returns (inserted job ids, duplicates).
+    """
+    from app import analytics, search
+    from app.ml import job_index
+    from app.ml.job_skills import get_or_create_skill_map
+    from app.ml.similar_jobs import compute_similar_jobs
+    from app.ml.skill_extractor import extract_skills_batch
+
+    unique = {}
+    for row in rows:
+        unique.setdefault(row["external_id"], row)
+    existing = _existing_external_ids(conn, source, unique)
+    new_rows = [row for key, row in unique.items() if key not in existing]
+    duplicates = len(rows) - len(new_rows)
+    if not new_rows:
+        return [], duplicates
+
+    # Stamped like ORM writes, so running web workers sync the batch into their job index
+    job_index.mark_pending(db.session)
+    version = job_index.bump_catalog_version(conn, job_index.CHANGES)
+    for row in new_rows:
+        row["index_version"] = version
+
+    # One multi-row INSERT, then the ids back through the (source, external_id) index
+    conn.execute(_jobs.insert(), new_rows)
+    jobs = conn.execute(
+        sa.select(Job.id, Job.company_id, Job.title, Job.description)
+        .where(Job.source == source, Job.external_id.in_([row["external_id"] for row in new_rows]))
+        .order_by(Job.id)
+    ).all()
+    job_ids = [job.id for job in jobs]
+
+    # Skills: one extractor pass and one category lookup for the batch
+    skill_lists = extract_skills_batch([job.description for job in jobs])
+    categories = get_or_create_skill_map(s for skills in skill_lists for s in skills)
+    # Two spellings can share a row under a case-insensitive collation
+    links = [
+        {"job_id": job.id, "category_id": category_id}
+        for job, skills in zip(jobs, skill_lists)
+        for category_id in dict.fromkeys(categories[skill].id for skill in skills)
+    ]
+    if links:
+        conn.execute(job_skills.insert(), links)
+
+    # Derived tables the ORM flush hooks would otherwise maintain
+    search.index_jobs(conn, job_ids)
+    analytics.record_jobs(conn, [(job.id, job.company_id, job.title) for job in jobs])
+
+    # TF-IDF: one transform for this process's index, then the new jobs' neighbours
+    job_index.upsert_jobs([(job.id, job.description) for job in jobs])
+    compute_similar_jobs(job_ids)
+
+    return job_ids, duplicates
+
+
+# ===============================
+# IMPORT (resumable)
+# ===============================
+def _checkpoint(path, source, restart):
+    fingerprint = file_fingerprint(path)
+    previous = (
+        JobImport.query
+        .filter_by(fingerprint=fingerprint, source=source)
+        .order_by(JobImport.id.desc())
+        .first()
+    )
+    if previous and not restart:
+        return previous
+
+    job_import = JobImport(source=source, fingerprint=fingerprint, path=os.path.abspath(path))
+    db.session.add(job_import)
+    db.session.commit()
+    return job_import
+
+
+def import_jobs(path, source=None, fmt=None, batch_size=DEFAULT_BATCH_SIZE,
+                restart=False, rebuild_similar=True, echo=print):
+    """
+    Streams a feed file into the jobs table. Returns the JobImport row.
+    """
+    from app.cache import cache
+    from app.ml.job_index import get_job_index
+    from app.ml.similar_jobs import rebuild_similar_jobs
+
+    source = source or os.path.splitext(os.path.basename(path))[0]
+    job_import = _checkpoint(path, source, restart)
+
+    if job_import.status == "done":
+        echo(f"{path} was already imported (import #{job_import.id}); use --restart to import it again.")
+        return job_import
+    if job_import.rows_read:
+        echo(f"Resuming import #{job_import.id} after row {job_import.rows_read}.")
+
+    get_job_index()     # fit the vectorizer on the current catalog once, up front
+
+    companies = CompanyResolver(db.session.connection())
+    resume_after = job_import.rows_read
+    started = time.perf_counter()
+    rejects_shown = 0
+
+    def flush(batch, rejected, position):
+        conn = db.session.connection()
+        companies.conn = conn
+        companies.preload([row for _, row in batch])
+
+        valid = []
+        for row_position, row in batch:
+            values, reason = validate_row(row, companies, source, f"{job_import.fingerprint[:16]}:{row_position}")
+            if reason:
+                rejected.append((row_position, reason))
+            else:
+                valid.append(values)
+
+        job_ids, duplicates = insert_batch(conn, source, valid)
+
+        job_import.rows_read = position
+        job_import.inserted += len(job_ids)
+        job_import.duplicates += duplicates
+        job_import.rejected += len(rejected)
+        job_import.updated_at = datetime.utcnow()
+        db.session.commit()
+        cache.bump("jobs")
+
+        elapsed = time.perf_counter() - started
+        echo(f"  row {position}: {job_import.inserted} inserted, {job_import.duplicates} duplicates, "
+             f"{job_import.rejected} rejected ({(position - resume_after) / elapsed:.0f} rows/s)")
+        return _report_rejects(sorted(rejected), rejects_shown, echo)
+
+    try:
+        batch, rejected, position = [], [], resume_after
+        for position, row, error in read_rows(path, fmt):
+            if position <= resume_after:
+                continue
+            if error:
+                rejected.append((position, error))
+            else:
+                batch.append((position, row))
+
+            if len(batch) + len(rejected) >= batch_size:
+                rejects_shown = flush(batch, rejected, position)
+                batch, rejected = [], []
+
+        if batch or rejected:
+            rejects_shown = flush(batch, rejected, position)
+
+    except Exception as e:
+        db.session.rollback()
+        job_import.status = "failed"
+        job_import.error = str(e)
+        job_import.updated_at = datetime.utcnow()
+        db.session.commit()
+        echo(f"Import failed after row {job_import.rows_read}: {e}")
+        raise
+
+    job_import.status = "done"
+    job_import.error = None
+    db.session.commit()
+
+    if rebuild_similar and job_import.inserted:
+        echo("Rebuilding similar jobs ...")
+        rebuild_similar_jobs()
+    elif job_import.inserted:
+        # Only the new jobs got neighbour lists; existing jobs' lists can't include them yet
+        echo("Skipped the similar-jobs rebuild: run `flask --app run rebuild-similar-jobs` next.")
+
+    processed = job_import.rows_read - resume_after
+    elapsed = time.perf_counter() - started
+    echo(f"Imported {job_import.inserted} jobs from {path}: {job_import.duplicates} duplicates, "
+         f"{job_import.rejected} rejected; {processed} rows in {elapsed:.1f}s "
+         f"({processed / elapsed if elapsed else 0:.0f} rows/s).")
+    return job_import
+
+
+def _report_rejects(rejected, shown, echo):
+    for position, reason in rejected:
+        if shown >= MAX_REPORTED_REJECTS:
+            break
+        echo(f"  rejected row {position}: {reason}")
+        shown += 1
+    return shown
@@ -0,0 +1,124 @@
+"""
+Schema migrations.
+
+Every vNNNN_<name>.py module in this package defines a `description`
+and an `upgrade(conn)` function. Applied versions are recorded in the
+schema_migrations table. Each step also checks the live schema before
+changing it, so a database first built by db.create_all() can adopt
+the runner safely.
+
+    flask --app run db-upgrade
+"""
+import importlib
+import pkgutil
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from app import db
+
+
+_meta = sa.MetaData()
+
+schema_migrations = sa.Table(
+    "schema_migrations", _meta,
+    sa.Column("version", sa.String(20), primary_key=True),
+    sa.Column("description", sa.String(255)),
+    sa.Column("applied_at", sa.DateTime, nullable=False),
+)
+
+
+# ===============================
+# SCHEMA HELPERS (for migrations)
+# ===============================
+def has_table(conn, table_name):
+    return sa.inspect(conn).has_table(table_name)
+
+
+def has_column(conn, table_name, column_name):
+    columns = sa.inspect(conn).get_columns(table_name)
+    return any(column["name"] == column_name for column in columns)
+
+
+def has_index(conn, table_name, index_name):
+    inspector = sa.inspect(conn)
+    names = {index["name"] for index in inspector.get_indexes(table_name)}
+    names.update(c["name"] for c in inspector.get_unique_constraints(table_name))
+    return index_name in names
+
+
+def create_tables(conn, *tables):
+    db.metadata.create_all(conn, tables=[getattr(t, "__table__", t) for t in tables])
+
+
+def create_index(conn, table, index_name):
+    """
+    Creates the index declared on the model under index_name, if missing
+    """
+    table = getattr(table, "__table__", table)
+    index = next(index for index in table.indexes if index.name == index_name)
+    if not has_index(conn, table.name, index_name):
+        index.create(conn)
+        return True
+    return False
+
+
+def add_column(conn, table_name, column_name, ddl):
+    """
+    ddl: the column definition, e.g. "VARCHAR(20) DEFAULT 'done'"
+    """
+    if not has_column(conn, table_name, column_name):
+        conn.execute(sa.text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {ddl}"))
+        return True
+    return False
+
+
+# ===============================
+# RUNNER
+# ===============================
+def available_migrations():
+    """
+    Returns [(version, module)] sorted by version
+    """
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        if info.name[:1] == "v" and info.name[1:5].isdigit():
+            module = importlib.import_module(f"{__name__}.{info.name}")
+            migrations.append((info.name[1:5], module))
+    return sorted(migrations, key=lambda item: item[0])
+
+
+def applied_versions(conn):
+    schema_migrations.create(conn, checkfirst=True)
+    return {row.version for row in conn.execute(sa.select(schema_migrations.c.version))}
+
+
+def pending_migrations(engine=None):
+    engine = engine or db.engine
+    with engine.begin() as conn:
+        applied = applied_versions(conn)
+    return [(v, m) for v, m in available_migrations() if v not in applied]
+
+
+def upgrade(engine=None, echo=print):
+    """
+    Applies pending migrations in order, one transaction each.
+    Returns the versions applied.
+    """
+    from app import models  # noqa: F401  (fills db.metadata)
+
+    engine = engine or db.engine
+    applied = []
+
+    for version, module in pending_migrations(engine):
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version,
+                description=module.description,
+                applied_at=datetime.utcnow(),
+            ))
+        echo(f"Applied {version}: {module.description}")
+        applied.append(version)
+
+    return applied
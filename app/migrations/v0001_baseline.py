@@ -0,0 +1,8 @@
+from app.migrations import create_tables
+from app.models import User, Company, Job, Application, JobCategory, job_skills
+
+description = "Base tables (users, companies, jobs, applications, skills)"
+
+
+def upgrade(conn):
+    create_tables(conn, User, Company, Job, Application, JobCategory, job_skills)
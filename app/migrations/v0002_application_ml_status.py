@@ -0,0 +1,8 @@
+from app.migrations import add_column
+
+description = "applications.ml_status for background scoring"
+
+
+def upgrade(conn):
+    # Rows that predate the queue were scored inline, hence "done"
+    add_column(conn, "applications", "ml_status", "VARCHAR(20) DEFAULT 'done'")
@@ -0,0 +1,8 @@
+from app.migrations import create_tables
+from app.models import SimilarJob, BackgroundTask
+
+description = "similar_jobs and background_tasks tables"
+
+
+def upgrade(conn):
+    create_tables(conn, SimilarJob, BackgroundTask)
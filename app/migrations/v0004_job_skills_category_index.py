@@ -0,0 +1,8 @@
+from app.migrations import create_index
+from app.models import job_skills
+
+description = "Index job_skills.category_id for the skill facet"
+
+
+def upgrade(conn):
+    create_index(conn, job_skills, "ix_job_skills_category_id")
@@ -0,0 +1,48 @@
+import sqlalchemy as sa
+
+from app.migrations import create_index, has_index, has_table
+from app.models import Job, Application
+
+description = "Composite indexes for list views, unique application per job"
+
+
+BACKUP_TABLE = "applications_duplicates_backup"
+
+
+def _drop_duplicate_applications(conn):
+    """
+    Keeps the first application of each (job, seeker) pair so the
+    unique index can be built. The removed rows are copied to
+    BACKUP_TABLE first, and their ids printed.
+    """
+    # A derived table: MySQL can't delete from a table it selects from directly
+    keep = (
+        sa.select(sa.func.min(Application.id).label("id"))
+        .group_by(Application.job_id, Application.seeker_user_id)
+        .subquery("keep")
+    )
+    duplicates = sa.select(Application.__table__).where(Application.id.not_in(sa.select(keep.c.id)))
+
+    ids = [row.id for row in conn.execute(duplicates)]
+    if not ids:
+        return
+
+    sql = str(duplicates.compile(conn))
+    if has_table(conn, BACKUP_TABLE):
+        conn.execute(sa.text(f"INSERT INTO {BACKUP_TABLE} {sql}"))
+    else:
+        conn.execute(sa.text(f"CREATE TABLE {BACKUP_TABLE} AS {sql}"))
+
+    conn.execute(sa.delete(Application.__table__).where(Application.id.in_(ids)))
+    print(f"Removed {len(ids)} duplicate applications (copied to {BACKUP_TABLE}): ids {ids}")
+
+
+def upgrade(conn):
+    if not has_index(conn, "applications", "uq_applications_job_seeker"):
+        _drop_duplicate_applications(conn)
+        create_index(conn, Application, "uq_applications_job_seeker")
+
+    create_index(conn, Application, "ix_applications_seeker_applied")
+    create_index(conn, Application, "ix_applications_job_score")
+    create_index(conn, Job, "ix_jobs_posted")
+    create_index(conn, Job, "ix_jobs_poster_posted")
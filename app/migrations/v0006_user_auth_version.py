@@ -0,0 +1,7 @@
+from app.migrations import add_column
+
+description = "users.auth_version for session revocation"
+
+
+def upgrade(conn):
+    add_column(conn, "users", "auth_version", "INTEGER NOT NULL DEFAULT 0")
@@ -0,0 +1,11 @@
+from app.migrations import create_tables
+from app.models import AnalyticsRollup
+
+description = "analytics_rollups for the admin dashboard"
+
+
+def upgrade(conn):
+    from app.analytics import compute_rollups, write_rollups
+
+    create_tables(conn, AnalyticsRollup)
+    write_rollups(conn, compute_rollups(conn))
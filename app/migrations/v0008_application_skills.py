@@ -0,0 +1,13 @@
+import sqlalchemy as sa
+
+from app.migrations import create_tables
+from app.models import application_skills
+
+description = "application_skills mapping table (fill with flask backfill-application-skills)"
+
+
+def upgrade(conn):
+    create_tables(conn, application_skills)
+
+    # Skill counts are now a GROUP BY over application_skills
+    conn.execute(sa.text("DELETE FROM analytics_rollups WHERE metric = 'skills'"))
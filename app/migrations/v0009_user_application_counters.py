@@ -0,0 +1,14 @@
+from app.migrations import add_column
+
+description = "Denormalized application counters on users"
+
+
+def upgrade(conn):
+    from app.user_counters import refresh_user_counters
+
+    add_column(conn, "users", "application_count", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "users", "latest_application_id", "INTEGER")
+    add_column(conn, "users", "latest_resume_application_id", "INTEGER")
+    add_column(conn, "users", "has_skills", "BOOLEAN NOT NULL DEFAULT 0")
+
+    refresh_user_counters(conn)
@@ -0,0 +1,8 @@
+description = "job_search full-text table (MySQL FULLTEXT / SQLite FTS5)"
+
+
+def upgrade(conn):
+    from app.search import create_search_table, reindex_all
+
+    create_search_table(conn)
+    reindex_all(conn)
@@ -0,0 +1,18 @@
+from app.migrations import add_column, create_index
+from app.models import User
+
+description = "Normalized user name/email, role and prefix indexes, user_search n-gram table"
+
+
+def upgrade(conn):
+    from app.user_search import backfill_normalized, create_user_search_table, reindex_users
+
+    add_column(conn, "users", "name_normalized", "VARCHAR(120)")
+    add_column(conn, "users", "email_normalized", "VARCHAR(150)")
+    backfill_normalized(conn)
+
+    for name in ("ix_users_role_id", "ix_users_email_norm", "ix_users_name_norm"):
+        create_index(conn, User, name)
+
+    create_user_search_table(conn)
+    reindex_users(conn)
@@ -0,0 +1,11 @@
+from app.migrations import add_column, create_index, create_tables
+from app.models import Job, JobImport
+
+description = "Feed source/external_id on jobs, job_imports checkpoints"
+
+
+def upgrade(conn):
+    add_column(conn, "jobs", "source", "VARCHAR(80)")
+    add_column(conn, "jobs", "external_id", "VARCHAR(120)")
+    create_index(conn, Job, "uq_jobs_source_external")
+    create_tables(conn, JobImport)
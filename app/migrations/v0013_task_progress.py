@@ -0,0 +1,8 @@
+from app.migrations import add_column
+
+description = "Progress counters on background_tasks"
+
+
+def upgrade(conn):
+    add_column(conn, "background_tasks", "progress", "INTEGER NOT NULL DEFAULT 0")
+    add_column(conn, "background_tasks", "total", "INTEGER")
@@ -0,0 +1,14 @@
+import sqlalchemy as sa
+
+from app.migrations import create_tables
+from app.models import CatalogVersion, UserRecommendation
+
+description = "Per-user recommendation cache and the job catalog version"
+
+
+def upgrade(conn):
+    create_tables(conn, UserRecommendation, CatalogVersion)
+
+    versions = CatalogVersion.__table__
+    if not conn.execute(sa.select(versions.c.name).where(versions.c.name == "jobs")).first():
+        conn.execute(versions.insert().values(name="jobs", version=0))
@@ -0,0 +1,9 @@
+from app.migrations import add_column, create_index
+from app.models import Job
+
+description = "Job index catalog version stamp on jobs"
+
+
+def upgrade(conn):
+    add_column(conn, "jobs", "index_version", "INTEGER NOT NULL DEFAULT 0")
+    create_index(conn, Job, "ix_jobs_index_version")
@@ -0,0 +1,7 @@
+from app.migrations import add_column
+
+description = "Retry backoff on background_tasks"
+
+
+def upgrade(conn):
+    add_column(conn, "background_tasks", "run_after", "DATETIME")
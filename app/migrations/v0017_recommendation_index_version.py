@@ -0,0 +1,13 @@
+import sqlalchemy as sa
+
+from app.migrations import add_column, has_column
+
+description = "Recommendation cache watermark: job index version instead of max job id"
+
+
+def upgrade(conn):
+    add_column(conn, "user_recommendations", "index_version", "INTEGER NOT NULL DEFAULT 0")
+    if has_column(conn, "user_recommendations", "max_job_id"):
+        conn.execute(sa.text("ALTER TABLE user_recommendations DROP COLUMN max_job_id"))
+    # Lists stored against max_job_id don't know their version: recompute on next read
+    conn.execute(sa.text("DELETE FROM user_recommendations"))
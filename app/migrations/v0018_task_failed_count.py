@@ -0,0 +1,7 @@
+from app.migrations import add_column
+
+description = "Failed item counter on background_tasks"
+
+
+def upgrade(conn):
+    add_column(conn, "background_tasks", "failed", "INTEGER NOT NULL DEFAULT 0")
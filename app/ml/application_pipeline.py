@@ -0,0 +1,48 @@
+from app import db
+from app.models import Application
+from app.tasks import task_handler, report_progress
+from app.ml.resume_matcher import calculate_match_scores
+from app.ml.resume_text import get_resume_text
+from app.ml.skill_extractor import extract_skills
+from app.ml.job_skills import set_application_skills
+from app.ml.rescoring import rescore_job
+from app.user_counters import record_skills
+
+
+def _mark_failed(application_id):
+    application = Application.query.get(application_id)
+    if application:
+        application.ml_status = "failed"
+        db.session.commit()
+
+
+@task_handler("score_application", on_failure=_mark_failed)
+def score_application(application_id):
+    """
+    Parses the resume, scores it against the job and extracts skills
+    """
+    application = Application.query.get(application_id)
+    if not application:
+        return
+
+    resume_text = get_resume_text(application.resume_file_path)
+    if not resume_text:
+        # Unreadable or timed out: retried, then marked failed (not a 0% match)
+        raise ValueError(f"No text extracted from {application.resume_file_path}")
+
+    application.match_score = float(
+        calculate_match_scores(resume_text, [application.job.description])[0]
+    )
+    set_application_skills(application, extract_skills(resume_text))
+    record_skills(application)
+    application.ml_status = "done"
+
+    db.session.commit()
+
+
+@task_handler("rescore_job")
+def rescore_job_applications(job_id):
+    """
+    Re-scores a job's applications after its description changed
+    """
+    rescore_job(job_id, progress=report_progress)
@@ -0,0 +1,349 @@
+import threading
+
+import numpy as np
+import sqlalchemy as sa
+from scipy import sparse
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app import db
+from app.models import CatalogVersion, Job
+from app.ml.resume_matcher import pairwise_match_scores, term_counts
+from app.ml.retrieval import chunked_top_k
+
+
+# Jobs with shorter descriptions carry too little text to match against
+MIN_DESCRIPTION_LENGTH = 20
+
+# Refit the vocabulary once this share of the catalog changed since the
+# last fit (new jobs are only transformed with the old vocabulary/IDF)
+REFIT_RATIO = 0.2
+
+
+def _is_indexable(description):
+    return bool(description) and len(description.strip()) > MIN_DESCRIPTION_LENGTH
+
+
+class JobIndex:
+    """
+    Long-lived TF-IDF index over job descriptions.
+
+    Holds the fitted vocabulary and an L2-normalised sparse job matrix
+    (job-to-job similarity is one sparse dot product), and raw term
+    counts alongside for resume match scores (top_matches).
+    """
+
+    def __init__(self, max_features=3000):
+        self.max_features = max_features
+        self.vectorizer = None
+        self.matrix = None          # CSR, one row per indexed job
+        self.counts = None          # CSR term counts, same rows
+        self.job_ids = np.empty(0, dtype=np.int64)
+        self.alive = np.empty(0, dtype=bool)
+        self._rows = {}             # job id -> row in matrix
+        self._texts = {}            # job id -> hash of the description last indexed
+        self._changes = 0
+        self.built = False
+        self.versions = None        # catalog versions (changes, deletes) it reflects
+        self._lock = threading.RLock()
+
+    # ===============================
+    # BUILD
+    # ===============================
+    def build(self, jobs, versions=None):
+        """
+        jobs: iterable of (job_id, description), read after `versions`
+        """
+        ids = []
+        texts = []
+        hashes = {}
+        for job_id, description in jobs:
+            hashes[job_id] = hash(description)
+            if _is_indexable(description):
+                ids.append(job_id)
+                texts.append(description)
+
+        vectorizer = TfidfVectorizer(
+            stop_words="english",
+            max_features=self.max_features
+        )
+
+        if texts:
+            matrix = vectorizer.fit_transform(texts).tocsr()
+            counts = term_counts(texts)
+        else:
+            vectorizer = None
+            matrix = None
+            counts = None
+
+        with self._lock:
+            self.vectorizer = vectorizer
+            self.matrix = matrix
+            self.counts = counts
+            self.job_ids = np.asarray(ids, dtype=np.int64)
+            self.alive = np.ones(len(ids), dtype=bool)
+            self._rows = {job_id: row for row, job_id in enumerate(ids)}
+            self._texts = hashes
+            self._changes = 0
+            self.versions = versions
+            self.built = True
+
+    @property
+    def size(self):
+        return len(self._rows)
+
+    @property
+    def indexed_ids(self):
+        """
+        Every job id upserted, with or without an indexable description
+        """
+        with self._lock:
+            return set(self._texts)
+
+    @property
+    def needs_refit(self):
+        if self.vectorizer is None:
+            return self._changes > 0
+        return self._changes > max(1, int(self.size * REFIT_RATIO))
+
+    # ===============================
+    # INCREMENTAL UPDATES
+    # ===============================
+    def upsert(self, job_id, description):
+        self.upsert_many([(job_id, description)])
+
+    def upsert_many(self, jobs):
+        """
+        jobs: [(job_id, description)], transformed in one call. A job
+        already indexed with the same text is skipped: the route's upsert
+        and the next catalog sync see the same committed row.
+        """
+        with self._lock:
+            ids, texts = [], []
+            for job_id, description in jobs:
+                digest = hash(description)
+                if self._texts.get(job_id) == digest:
+                    continue
+                self._texts[job_id] = digest
+                self._drop_row(job_id)
+                self._changes += 1
+                if _is_indexable(description):
+                    ids.append(job_id)
+                    texts.append(description)
+
+            if not texts or self.vectorizer is None:
+                return
+
+            self.matrix = sparse.vstack([self.matrix, self.vectorizer.transform(texts)], format="csr")
+            self.counts = sparse.vstack([self.counts, term_counts(texts)], format="csr")
+            start = len(self.job_ids)
+            self.job_ids = np.append(self.job_ids, ids)
+            self.alive = np.append(self.alive, np.ones(len(ids), dtype=bool))
+            self._rows.update((job_id, start + i) for i, job_id in enumerate(ids))
+
+    def remove(self, job_id):
+        with self._lock:
+            self._texts.pop(job_id, None)
+            if self._drop_row(job_id):
+                self._changes += 1
+
+    def _drop_row(self, job_id):
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return False
+        # Rows are only flagged dead; the next refit compacts the matrix.
+        # In place: readers only ever lose a job they were about to skip.
+        self.alive[row] = False
+        return True
+
+    # ===============================
+    # SCORING
+    # ===============================
+    def similar_to(self, job_id):
+        """
+        Returns (job_ids, cosine scores) of every other live job
+        """
+        with self._lock:
+            matrix = self.matrix
+            job_ids = self.job_ids
+            alive = self.alive
+            row = self._rows.get(job_id)
+
+        if row is None:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        scores = (matrix @ matrix[row].T).toarray().ravel()
+
+        others = alive.copy()
+        others[row] = False
+        return job_ids[others], scores[others]
+
+    def top_matches(self, text, k, threshold=0.0):
+        """
+        Returns (job_ids, match percentages) of the k best live jobs scoring
+        at least `threshold` percent, best first
+        """
+        with self._lock:
+            counts = self.counts
+            job_ids = self.job_ids
+            alive = self.alive
+
+        if counts is None or not text:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        query = term_counts([text])
+        rows, scores = chunked_top_k(
+            lambda start, end: np.round(
+                pairwise_match_scores(query, counts[start:end]) * 100, 2
+            ),
+            counts.shape[0], k, threshold=threshold, alive=alive
+        )
+        return job_ids[rows], scores
+
+
+# ===============================
+# CATALOG VERSIONS (shared by all processes)
+# ===============================
+# "job_index" is bumped by every job insert or description edit, and
+# stamped on the row (Job.index_version); "job_deletes" by every delete.
+# The bump's row lock orders writers, so jobs stamped above a version
+# read earlier are exactly the ones committed since.
+CHANGES = "job_index"
+DELETES = "job_deletes"
+
+_versions = CatalogVersion.__table__
+
+
+def catalog_versions(*names):
+    """
+    Returns {name: version} (0 for rows not created yet)
+    """
+    found = dict(db.session.execute(
+        sa.select(_versions.c.name, _versions.c.version).where(_versions.c.name.in_(names))
+    ).all())
+    return {name: found.get(name, 0) for name in names}
+
+
+def bump_catalog_version(conn, name):
+    """
+    Increments a version in the caller's transaction; returns the new value
+    """
+    bumped = conn.execute(
+        _versions.update()
+        .where(_versions.c.name == name)
+        .values(version=_versions.c.version + 1)
+    )
+    if not bumped.rowcount:
+        conn.execute(_versions.insert().values(name=name, version=1))
+    return conn.execute(sa.select(_versions.c.version).where(_versions.c.name == name)).scalar()
+
+
+def mark_pending(session):
+    """
+    The session's transaction bumped a catalog version: until it ends,
+    get_job_index() must not sync to that uncommitted number (a rollback
+    would hand it to the next writer, whose jobs would then be skipped)
+    """
+    session.info["job_writes_pending"] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_pending(session):
+    session.info.pop("job_writes_pending", None)
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_changed_jobs(session, flush_context, instances):
+    changed = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Job) and obj not in session.deleted
+        and (obj in session.new or inspect(obj).attrs["description"].history.has_changes())
+    ]
+    if changed:
+        mark_pending(session)
+        version = bump_catalog_version(session.connection(), CHANGES)
+        for job in changed:
+            job.index_version = version
+
+
+@event.listens_for(Session, "after_flush")
+def _count_deleted_jobs(session, flush_context):
+    if any(isinstance(obj, Job) for obj in session.deleted):
+        mark_pending(session)
+        bump_catalog_version(session.connection(), DELETES)
+
+
+# ===============================
+# PROCESS-WIDE INDEX
+# ===============================
+_index = JobIndex()
+_build_lock = threading.Lock()
+
+
+def _load_jobs():
+    return Job.query.with_entities(Job.id, Job.description).yield_per(1000)
+
+
+def _sync(versions):
+    """
+    Applies the job writes committed (by any process) since the index's
+    versions: re-reads stamped rows, and drops deleted ids when needed
+    """
+    changed = (
+        Job.query
+        .with_entities(Job.id, Job.description)
+        .filter(Job.index_version > _index.versions[CHANGES])
+        .all()
+    )
+    _index.upsert_many(changed)
+
+    if versions[DELETES] != _index.versions[DELETES]:
+        live = {job_id for (job_id,) in Job.query.with_entities(Job.id)}
+        for job_id in _index.indexed_ids - live:
+            _index.remove(job_id)
+
+    _index.versions = versions
+
+
+def get_job_index():
+    """
+    Returns the shared index, (re)building it from the DB when needed and
+    catching up with jobs written by other processes since it was built.
+    Must be called inside an app context.
+    """
+    if _index.built and db.session.info.get("job_writes_pending"):
+        return _index       # this transaction's own job writes: see mark_pending
+
+    versions = catalog_versions(CHANGES, DELETES)
+    if _index.versions != versions or not _index.built or _index.needs_refit:
+        with _build_lock:
+            versions = catalog_versions(CHANGES, DELETES)   # another thread may have synced
+            if not _index.built or _index.needs_refit:
+                _index.build(_load_jobs(), versions)
+            elif _index.versions != versions:
+                _sync(versions)
+    return _index
+
+
+def upsert_job(job):
+    """
+    Call after a job create/edit has been committed (other processes
+    pick it up through the catalog version)
+    """
+    _index.upsert(job.id, job.description)
+
+
+def upsert_jobs(jobs):
+    """
+    Batch form of upsert_job: jobs is [(job_id, description)]
+    """
+    _index.upsert_many(jobs)
+
+
+def remove_job(job_id):
+    """
+    Call after a job delete has been committed
+    """
+    _index.remove(job_id)
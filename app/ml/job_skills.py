@@ -0,0 +1,138 @@
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models import Job, JobCategory, Application
+from app.ml.skill_extractor import extract_skills, extract_skills_batch
+
+
+def get_or_create_skill_map(names):
+    """
+    Returns {name: JobCategory} for the given skill names, creating missing
+    ones. Keyed by the names as given: under a case-insensitive collation
+    the row for "NLP" may be stored as "Nlp".
+    """
+    names = sorted(set(names))
+    if not names:
+        return {}
+
+    existing = {
+        c.name: c
+        for c in JobCategory.query.filter(JobCategory.name.in_(names)).all()
+    }
+
+    for name in names:
+        if name in existing:
+            continue
+        try:
+            # Savepoint: a concurrent request may insert the same skill
+            with db.session.begin_nested():
+                category = JobCategory(name=name)
+                db.session.add(category)
+            existing[name] = category
+        except IntegrityError:
+            existing[name] = JobCategory.query.filter_by(name=name).one()
+
+    return {name: existing[name] for name in names}
+
+
+def get_or_create_skills(names):
+    """
+    Returns JobCategory rows for the given skill names, creating missing ones
+    """
+    return list(get_or_create_skill_map(names).values())
+
+
+def sync_job_skills(job):
+    """
+    Call on job create/edit, before the commit
+    """
+    job.categories = _distinct(get_or_create_skills(extract_skills(job.description)))
+
+
+def backfill_job_skills(batch_size=500):
+    """
+    Re-extracts skills for every job. Returns the number of jobs processed.
+    """
+    processed = 0
+    last_id = 0
+
+    while True:
+        jobs = (
+            Job.query
+            .filter(Job.id > last_id)
+            .order_by(Job.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not jobs:
+            break
+
+        skill_lists = extract_skills_batch([job.description for job in jobs])
+        categories = get_or_create_skill_map(s for skills in skill_lists for s in skills)
+
+        for job, skills in zip(jobs, skill_lists):
+            job.categories = _distinct(categories[s] for s in skills)
+
+        db.session.commit()
+        processed += len(jobs)
+        last_id = jobs[-1].id
+
+    return processed
+
+
+# ===============================
+# APPLICATION SKILLS
+# ===============================
+def split_skills(skills):
+    """
+    Application.skills is comma-separated
+    """
+    if not skills:
+        return []
+    return [s.strip() for s in skills.split(",") if s.strip()]
+
+
+def _distinct(categories):
+    # Case variants can map to one row under a case-insensitive collation
+    return list({c.id: c for c in categories}.values())
+
+
+def set_application_skills(application, skills):
+    """
+    Stores extracted skills on both the display column and application_skills
+    """
+    application.skills = ", ".join(skills)
+    application.categories = _distinct(get_or_create_skills(skills))
+
+
+def backfill_application_skills(batch_size=500):
+    """
+    Fills application_skills from the existing comma-separated column.
+    Returns the number of applications processed.
+    """
+    processed = 0
+    last_id = 0
+
+    while True:
+        applications = (
+            Application.query
+            .filter(Application.id > last_id, Application.skills.isnot(None))
+            .order_by(Application.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not applications:
+            break
+
+        skill_lists = [split_skills(a.skills) for a in applications]
+        categories = get_or_create_skill_map(s for skills in skill_lists for s in skills)
+
+        for application, skills in zip(applications, skill_lists):
+            application.categories = _distinct(categories[s] for s in skills)
+
+        db.session.commit()
+        processed += len(applications)
+        last_id = applications[-1].id
+
+    return processed
+
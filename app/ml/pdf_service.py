@@ -0,0 +1,316 @@
+import multiprocessing
+import os
+import re
+import signal
+import threading
+
+import pdfplumber
+import pypdfium2 as pdfium
+
+
+# ===============================
+# CONFIG (env overridable)
+# ===============================
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", 2))
+PDF_TIMEOUT = float(os.getenv("PDF_TIMEOUT", 15))            # seconds per document
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 20))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 100_000))
+PDF_TASKS_PER_WORKER = int(os.getenv("PDF_TASKS_PER_WORKER", 50))
+WORKER_START_TIMEOUT = 60                                     # imports in a fresh process
+
+# auto:       pdfium, falling back to pdfplumber when its text looks broken
+# pdfium:     pdfium only (fastest)
+# pdfplumber: layout analysis only (slowest, the original behaviour)
+PDF_ENGINE = os.getenv("PDF_ENGINE", "auto")
+
+
+# ===============================
+# ENGINES (run inside a worker process)
+# ===============================
+def _read_pages(page_texts, max_chars):
+    parts = []
+    total = 0
+    for page_text in page_texts:
+        if page_text:
+            parts.append(page_text)
+            total += len(page_text) + 1
+        if total >= max_chars:
+            break
+    return " ".join(parts)[:max_chars].strip()
+
+
+def extract_pdfplumber(pdf_path, max_pages, max_chars):
+    with pdfplumber.open(pdf_path) as pdf:
+        return _read_pages(
+            (page.extract_text() for page in pdf.pages[:max_pages]), max_chars
+        )
+
+
+# pdfium marks soft hyphens / unmapped glyphs with control characters
+_CONTROL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _pdfium_text(pdf_path, max_pages, max_chars):
+    """
+    Returns (text, pages read)
+    """
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        pages = min(len(pdf), max_pages)
+
+        def page_texts():
+            for index in range(pages):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+                yield _CONTROL.sub("", text.replace("\r\n", "\n"))
+
+        return _read_pages(page_texts(), max_chars), pages
+    finally:
+        pdf.close()
+
+
+def extract_pdfium(pdf_path, max_pages, max_chars):
+    return _pdfium_text(pdf_path, max_pages, max_chars)[0]
+
+
+# ===============================
+# QUALITY HEURISTIC (auto engine)
+# ===============================
+MIN_CHARS_PER_PAGE = 50         # less means no text layer (scans) or lost glyphs
+MIN_LETTER_RATIO = 0.6          # of non-space characters
+MAX_AVG_WORD_LENGTH = 15        # longer means the spaces were lost
+MAX_BAD_GLYPH_RATIO = 0.02      # U+FFFD, (cid:NN) placeholders
+
+
+def text_problem(text, pages):
+    """
+    Returns why extracted text looks broken, or None if it looks usable
+    """
+    if len(text) < MIN_CHARS_PER_PAGE * max(pages, 1):
+        return "too little text"
+
+    visible = [ch for ch in text if not ch.isspace()]
+    bad = text.count("\ufffd") + 4 * text.count("(cid:")
+    if bad > MAX_BAD_GLYPH_RATIO * len(visible):
+        return "unmapped glyphs"
+
+    letters = sum(ch.isalpha() for ch in visible)
+    if letters < MIN_LETTER_RATIO * len(visible):
+        return "mostly non-letters"
+
+    words = text.split()
+    if sum(map(len, words)) / len(words) > MAX_AVG_WORD_LENGTH:
+        return "missing spaces"
+
+    return None
+
+
+def extract_text_limited(pdf_path, max_pages, max_chars, engine=PDF_ENGINE):
+    """
+    Runs inside a worker process: stops after max_pages or max_chars
+    """
+    if engine == "pdfplumber":
+        return extract_pdfplumber(pdf_path, max_pages, max_chars)
+
+    try:
+        text, pages = _pdfium_text(pdf_path, max_pages, max_chars)
+    except pdfium.PdfiumError:
+        if engine == "pdfium":
+            raise
+        text, problem = "", "pdfium error"
+    else:
+        if engine == "pdfium":
+            return text
+        problem = text_problem(text, pages)
+
+    if problem is None:
+        return text
+
+    fallback = extract_pdfplumber(pdf_path, max_pages, max_chars)
+    # A scan has no text layer for either engine: keep whichever found more
+    if problem == "too little text" and len(fallback) <= len(text):
+        return text
+    return fallback
+
+
+# ===============================
+# WORKER PROCESSES
+# ===============================
+def _worker_main(conn):
+    """
+    Worker process loop: one extract_text_limited request at a time
+    """
+    conn.send("ready")
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        try:
+            conn.send(("ok", extract_text_limited(*request)))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """
+    One extraction process and its pipe. Runs a single document at a
+    time, so killing it on a timeout affects that document only.
+    """
+
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.tasks = 0
+
+        if not self.conn.poll(WORKER_START_TIMEOUT) or self.conn.recv() != "ready":
+            self.stop(kill=True)
+            raise RuntimeError("PDF worker did not start")
+
+    def run(self, request, timeout):
+        """
+        Returns ("ok", text) / ("error", message), or None on timeout.
+        Raises EOFError / OSError when the process died.
+        """
+        self.conn.send(request)
+        if not self.conn.poll(timeout):
+            return None
+        self.tasks += 1
+        return self.conn.recv()
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise _Timeout()
+
+
+class PdfExtractionService:
+    """
+    Extracts PDF text in separate worker processes so a pathological file
+    can neither hold the GIL of a web worker nor run unbounded: the
+    worker of a document that times out is killed (and replaced on
+    demand) without touching the others. At most `workers` run at once;
+    each is recycled after `tasks_per_worker` documents.
+
+    Processes that are workers themselves (rescore-applications) set
+    `inline` and extract in their own process instead of each starting
+    a pool of its own.
+    """
+
+    def __init__(self, workers=PDF_WORKERS, timeout=PDF_TIMEOUT,
+                 max_pages=PDF_MAX_PAGES, max_chars=PDF_MAX_CHARS,
+                 tasks_per_worker=PDF_TASKS_PER_WORKER, engine=PDF_ENGINE):
+        if engine not in ("auto", "pdfium", "pdfplumber"):
+            raise ValueError(f"Unknown PDF_ENGINE {engine!r}")
+        self.workers = workers
+        self.engine = engine
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.tasks_per_worker = tasks_per_worker
+        # spawn: forking a threaded web server is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle = []
+        self._lock = threading.Lock()
+        self.inline = False
+
+    def _checkout(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return _Worker(self._context)
+
+    def _checkin(self, worker):
+        if worker.tasks >= self.tasks_per_worker:
+            worker.stop()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def _extract_inline(self, pdf_path):
+        """
+        Same limits in the calling process. The timeout is a SIGALRM,
+        so it's only enforced on the main thread of a Unix process.
+        """
+        timed = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+        if timed:
+            previous = signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, self.timeout)
+        try:
+            return extract_text_limited(pdf_path, self.max_pages, self.max_chars, self.engine)
+        except _Timeout:
+            print("PDF extraction timed out:", pdf_path)
+            return ""
+        except Exception as e:
+            print("PDF read error:", f"{type(e).__name__}: {e}")
+            return ""
+        finally:
+            if timed:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous)
+
+    def extract(self, pdf_path):
+        if self.inline:
+            return self._extract_inline(pdf_path)
+
+        request = (pdf_path, self.max_pages, self.max_chars, self.engine)
+
+        with self._slots:
+            try:
+                worker = self._checkout()
+            except (RuntimeError, EOFError, OSError) as e:
+                print("PDF worker failed to start:", e)
+                return ""
+
+            try:
+                result = worker.run(request, self.timeout)
+            except (EOFError, OSError) as e:
+                # The process died mid-document (e.g. a crash in native code)
+                print("PDF worker died:", pdf_path, e)
+                worker.stop(kill=True)
+                return ""
+
+            if result is None:
+                print("PDF extraction timed out:", pdf_path)
+                worker.stop(kill=True)
+                return ""
+            self._checkin(worker)
+
+        status, value = result
+        if status == "error":
+            print("PDF read error:", value)
+            return ""
+        return value
+
+    def shutdown(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+pdf_service = PdfExtractionService()
@@ -0,0 +1,193 @@
+"""
+Per-user job recommendation cache.
+
+user_recommendations keeps each user's top CACHE_TOP_N jobs (match %,
+best first) together with what they were computed from:
+
+    resume_application_id  a newer resume (or apply_job) invalidates
+    catalog_version        bumped when a job description is edited
+    index_version          the job index version (job_index.CHANGES) the
+                           list covers: jobs stamped above it were written
+                           later, by any process, and are scored and
+                           merged into the list
+
+The watermark is a committed DB version, not the highest job id in a
+process's index, so a job committed after a higher id (or still missing
+from this process's index) is scored on the next read. Deleted jobs are
+dropped when the list is read; the list is recomputed only when too few
+remain. Match percentages don't depend on the fitted TF-IDF vocabulary,
+so a process's refits don't invalidate entries.
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+
+from app import db
+from app.models import CatalogVersion, Job, UserRecommendation
+from app.ml.job_index import CHANGES, _is_indexable, bump_catalog_version, get_job_index
+from app.ml.resume_matcher import calculate_match_scores
+from app.ml.resume_text import get_resume_text
+
+
+CACHE_TOP_N = 20            # kept per user; pages ask for up to this many
+MIN_SCORE = 0.01            # match %
+MAX_INCREMENTAL_JOBS = 5000  # more new jobs than this: full recompute instead
+
+CATALOG = "jobs"
+
+
+# ===============================
+# CATALOG VERSION (description edits)
+# ===============================
+def catalog_version():
+    row = db.session.get(CatalogVersion, CATALOG)
+    return row.version if row else 0
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_description_edit(session, flush_context):
+    """
+    Scores depend on the description only: new jobs are merged
+    incrementally and deleted ones filtered on read
+    """
+    for obj in session.dirty:
+        if isinstance(obj, Job) and obj not in session.deleted:
+            if inspect(obj).attrs["description"].history.has_changes():
+                # Upsert: the row is missing on a create_all() database
+                bump_catalog_version(session.connection(), CATALOG)
+                return
+
+
+def invalidate_recommendations(user_id):
+    """
+    Call when the user uploads a resume (same transaction)
+    """
+    UserRecommendation.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+
+
+# ===============================
+# COMPUTE
+# ===============================
+def _full(resume_text):
+    """
+    Returns (top [(job_id, score)], job index version covered)
+    """
+    index = get_job_index()
+    # Read first: jobs the index picks up meanwhile are just scored again
+    version = index.versions[CHANGES]
+    job_ids, scores = index.top_matches(resume_text, CACHE_TOP_N, threshold=MIN_SCORE)
+    return list(zip(job_ids.tolist(), scores.tolist())), version
+
+
+def _merge_new_jobs(top, resume_text, new_jobs):
+    """
+    Scores only the jobs written since the list was computed (some may
+    already be in it: the index can run ahead of its version)
+    """
+    rescored = {job_id for job_id, _ in new_jobs}
+    top = [(job_id, score) for job_id, score in top if job_id not in rescored]
+    new_jobs = [(job_id, description) for job_id, description in new_jobs if _is_indexable(description)]
+    if not new_jobs:
+        return top
+
+    scores = calculate_match_scores(resume_text, [description for _, description in new_jobs])
+    merged = top + [
+        (job_id, float(score))
+        for (job_id, _), score in zip(new_jobs, scores)
+        if score >= MIN_SCORE
+    ]
+    merged.sort(key=lambda item: -item[1])
+    return merged[:CACHE_TOP_N]
+
+
+def _save(user_id, entry, resume_application_id, version, index_version, top):
+    if entry is None:
+        entry = UserRecommendation(user_id=user_id)
+        db.session.add(entry)
+    entry.resume_application_id = resume_application_id
+    entry.catalog_version = version
+    entry.index_version = index_version
+    entry.top_jobs = json.dumps([[job_id, round(score, 2)] for job_id, score in top])
+    entry.updated_at = datetime.utcnow()
+
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request stored the same user's list first
+        db.session.rollback()
+
+
+def cached_top_jobs(user, resume_path, force=False):
+    """
+    Returns [(job_id, match %)] best first, from the cache when it is
+    still valid, merging in new jobs when there are any
+    """
+    entry = db.session.get(UserRecommendation, user.id)
+    version = catalog_version()
+
+    valid = (
+        not force
+        and entry is not None
+        and entry.resume_application_id == user.latest_resume_application_id
+        and entry.catalog_version == version
+    )
+
+    if valid:
+        top = [tuple(item) for item in json.loads(entry.top_jobs)]
+        new_jobs = (
+            db.session.query(Job.id, Job.description, Job.index_version)
+            .filter(Job.index_version > entry.index_version)
+            .order_by(Job.index_version)
+            .limit(MAX_INCREMENTAL_JOBS + 1)
+            .all()
+        )
+        if not new_jobs:
+            return top
+        if len(new_jobs) <= MAX_INCREMENTAL_JOBS:
+            top = _merge_new_jobs(top, get_resume_text(resume_path),
+                                  [(job.id, job.description) for job in new_jobs])
+            _save(user.id, entry, entry.resume_application_id, version, new_jobs[-1].index_version, top)
+            return top
+
+    resume_text = get_resume_text(resume_path)
+    if not resume_text:
+        return []
+
+    top, index_version = _full(resume_text)
+    _save(user.id, entry, user.latest_resume_application_id, version, index_version, top)
+    return top
+
+
+def _load_jobs(top, threshold):
+    wanted = [(job_id, score) for job_id, score in top if score >= threshold]
+    if not wanted:
+        return [], 0
+    jobs_by_id = {
+        job.id: job
+        for job in Job.query
+        .filter(Job.id.in_([job_id for job_id, _ in wanted]))
+        .options(joinedload(Job.company))
+    }
+    results = [(jobs_by_id[job_id], score) for job_id, score in wanted if job_id in jobs_by_id]
+    return results, len(wanted) - len(results)
+
+
+def recommended_jobs(user, resume_path, limit=5, threshold=0.0):
+    """
+    Returns [(job, match %)] for the user's best `limit` jobs scoring at
+    least `threshold` percent
+    """
+    if limit > CACHE_TOP_N:
+        raise ValueError(f"At most {CACHE_TOP_N} recommendations are cached")
+
+    top = cached_top_jobs(user, resume_path)
+    results, deleted = _load_jobs(top, threshold)
+
+    # Deleted jobs left a full list short: the next best ones are unknown
+    if deleted and len(results) < limit and len(top) >= CACHE_TOP_N:
+        results, _ = _load_jobs(cached_top_jobs(user, resume_path, force=True), threshold)
+
+    return results[:limit]
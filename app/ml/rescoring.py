@@ -0,0 +1,229 @@
+"""
+Bulk re-scoring of stored Application.match_score values.
+
+The match score is symmetric in (resume, job), so every resume of a job
+is scored against its description in one sparse matrix operation, with
+resume text read through the parsed-text cache (app/ml/resume_text.py).
+
+    rescore_job(job_id)   one job, after its description was edited
+                          (background task "rescore_job")
+    rescore_all(workers)  every application, in parallel chunks, after a
+                          scoring change (flask rescore-applications)
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import sqlalchemy as sa
+
+from app import db
+from app.models import Application, Job
+from app.ml.pdf_service import pdf_service
+from app.ml.resume_matcher import pairwise_match_scores, term_counts
+from app.ml.resume_text import get_resume_text
+
+
+RESCORE_CHUNK_SIZE = 500
+
+_applications = Application.__table__
+
+
+# ===============================
+# SCORING (no DB access: runs in worker processes too)
+# ===============================
+def score_resumes(job_description, resume_paths):
+    """
+    Match percentages of many resumes against one job description,
+    the same numbers calculate_match_scores gives pair by pair. NaN for
+    a resume whose text could not be read (parse error, timeout): its
+    stored score must be kept, not replaced by 0.
+    """
+    scores = np.full(len(resume_paths), np.nan)
+    texts = [get_resume_text(path) for path in resume_paths]
+    readable = [i for i, text in enumerate(texts) if text]
+    if readable:
+        scores[readable] = np.round(pairwise_match_scores(
+            term_counts([job_description or ""]),
+            term_counts([texts[i] for i in readable])
+        ) * 100, 2)
+    return scores
+
+
+def score_chunk(items, descriptions):
+    """
+    items: [(application_id, job_id, resume path)], descriptions: {job_id: text}
+    Returns ([(application_id, score)], number of unreadable resumes skipped)
+    """
+    by_job = {}
+    for application_id, job_id, path in items:
+        by_job.setdefault(job_id, []).append((application_id, path))
+
+    results, failed = [], 0
+    for job_id, rows in by_job.items():
+        scores = score_resumes(descriptions.get(job_id), [path for _, path in rows])
+        for (application_id, _), score in zip(rows, scores):
+            if np.isnan(score):
+                failed += 1
+            else:
+                results.append((application_id, float(score)))
+    return results, failed
+
+
+def _init_worker():
+    # Already a worker process: no nested PDF pool per worker
+    pdf_service.inline = True
+
+
+# ===============================
+# ONE JOB (background task)
+# ===============================
+def rescore_job(job_id, chunk_size=RESCORE_CHUNK_SIZE, progress=None):
+    """
+    Re-scores the job's scored applications against its current
+    description, committing per chunk. progress(done, total, failed) is
+    called before each commit; unreadable resumes keep their score and
+    count as failed. Returns the number of applications re-scored.
+    """
+    job = Job.query.get(job_id)
+    if not job:
+        return 0
+
+    # Applications still pending are scored by their own task, against the new text
+    scored = Application.query.filter_by(job_id=job_id, ml_status="done")
+    total = scored.count()
+    if progress:
+        progress(0, total)
+        db.session.commit()
+
+    done, failed, last_id = 0, 0, 0
+    while True:
+        applications = (
+            scored
+            .filter(Application.id > last_id)
+            .order_by(Application.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not applications:
+            break
+
+        scores = score_resumes(job.description, [a.resume_file_path for a in applications])
+        for application, score in zip(applications, scores):
+            if np.isnan(score):
+                failed += 1
+            else:
+                application.match_score = float(score)
+
+        done += len(applications)
+        last_id = applications[-1].id
+        if progress:
+            progress(done, total, failed)
+        db.session.commit()
+
+    return done - failed
+
+
+# ===============================
+# WHOLE DATABASE (CLI, worker processes)
+# ===============================
+def _chunks(chunk_size):
+    """
+    Yields (items, descriptions) in (job_id, id) order, so a chunk spans
+    few jobs and each job is scored in one matrix operation
+    """
+    last = (0, 0)
+    while True:
+        items = db.session.execute(
+            sa.select(Application.id, Application.job_id, Application.resume_file_path)
+            .where(
+                Application.ml_status == "done",
+                sa.tuple_(Application.job_id, Application.id) > sa.tuple_(*last),
+            )
+            .order_by(Application.job_id, Application.id)
+            .limit(chunk_size)
+        ).all()
+        if not items:
+            return
+
+        job_ids = {job_id for _, job_id, _ in items}
+        descriptions = dict(db.session.execute(
+            sa.select(Job.id, Job.description).where(Job.id.in_(job_ids))
+        ).all())
+
+        yield [tuple(item) for item in items], descriptions
+        last = (items[-1].job_id, items[-1].id)
+
+
+def _write_scores(results):
+    """
+    Writes a chunk's scores and moves the match_score rollup by the
+    difference in the same transaction, so the analytics never lag the
+    scores by more than the chunk being written
+    """
+    from app.analytics import record_score_change
+
+    if results:
+        ids = [a for a, _ in results]
+        old_total = db.session.execute(
+            sa.select(sa.func.coalesce(sa.func.sum(Application.match_score), 0))
+            .where(Application.id.in_(ids))
+        ).scalar()
+        db.session.execute(
+            _applications.update()
+            .where(_applications.c.id == sa.bindparam("application_id"))
+            .values(match_score=sa.bindparam("score")),
+            [{"application_id": a, "score": s} for a, s in results],
+        )
+        record_score_change(db.session.connection(), sum(s for _, s in results) - old_total)
+    db.session.commit()
+
+
+def rescore_all(workers=2, chunk_size=RESCORE_CHUNK_SIZE, echo=print):
+    """
+    Re-scores every scored application. Chunks are scored by `workers`
+    processes (inline when workers <= 1) and written back as they finish;
+    applications whose resume can't be read keep their score. Returns
+    the number of applications re-scored.
+    """
+    from app.analytics import rebuild_rollups
+    from app.cache import cache
+
+    total = Application.query.filter_by(ml_status="done").count()
+    started = time.perf_counter()
+    done = failed = 0
+
+    def report(chunk):
+        nonlocal done, failed
+        results, unreadable = chunk
+        _write_scores(results)
+        cache.bump("applications")
+        done += len(results)
+        failed += unreadable
+        elapsed = time.perf_counter() - started
+        echo(f"  {done + failed}/{total} applications, {failed} unreadable "
+             f"({(done + failed) / elapsed:.0f}/s)")
+
+    try:
+        if workers <= 1:
+            for items, descriptions in _chunks(chunk_size):
+                report(score_chunk(items, descriptions))
+        else:
+            # spawn: see pdf_service; at most two chunks in flight per worker
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker) as pool:
+                pending = []
+                for items, descriptions in _chunks(chunk_size):
+                    pending.append(pool.submit(score_chunk, items, descriptions))
+                    if len(pending) >= workers * 2:
+                        report(pending.pop(0).result())
+                for future in pending:
+                    report(future.result())
+    finally:
+        # Core updates skip the flush hooks: even after a failed chunk,
+        # recount what depends on the scores already written
+        db.session.rollback()
+        rebuild_rollups()
+        cache.bump("applications")
+    return done
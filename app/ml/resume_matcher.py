@@ -1,27 +1,104 @@
-from app.ml.recommender import extract_text_from_pdf
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
 
+from app.ml.resume_text import get_resume_text
 
-def calculate_match_score(resume_pdf_path, job_description):
+
+# Same tokenisation as the per-pair TfidfVectorizer used before, but
+# stateless, so job term counts can be computed once and reused
+_counter = HashingVectorizer(
+    stop_words="english",
+    alternate_sign=False,
+    norm=None,
+    n_features=2 ** 20
+)
+
+# Fitting TF-IDF on a (resume, job) pair gives smooth idf = ln(3 / (1 + df)) + 1:
+# 1.0 for terms in both documents, ln(1.5) + 1 for terms in only one
+_UNIQUE_IDF_SQ = (np.log(1.5) + 1) ** 2
+
+
+def term_counts(texts):
     """
-    Returns match percentage between resume & job description
+    Sparse raw term counts (one row per text) for pairwise_match_scores
     """
+    return _counter.transform(texts).tocsr()
 
-    resume_text = extract_text_from_pdf(resume_pdf_path)
 
-    if not resume_text or not job_description:
-        return 0.0
+def pairwise_match_scores(query_counts, doc_counts):
+    """
+    Cosine similarity between one document (1 x V) and each row of
+    doc_counts (N x V), as if a TfidfVectorizer had been fitted on every
+    (query, doc) pair separately — in one sparse matrix operation.
 
-    texts = [resume_text, job_description]
+    Returns an array of N scores in [0, 1].
+    """
+    n_docs = doc_counts.shape[0]
+    if n_docs == 0 or query_counts.nnz == 0:
+        return np.zeros(n_docs)
+
+    query_sq = query_counts.multiply(query_counts).tocsr()
+    query_bin = query_counts.copy()
+    query_bin.data[:] = 1
+
+    doc_sq = doc_counts.multiply(doc_counts).tocsr()
+    doc_bin = doc_counts.copy()
+    doc_bin.data[:] = 1
+
+    # Only shared terms contribute to the dot product (idf = 1 there)
+    dot = (doc_counts @ query_counts.T).toarray().ravel()
+
+    # Squared norms: every term weighted by the unique idf, minus the
+    # excess for the terms that turn out to be shared with the other side
+    query_shared = (doc_bin @ query_sq.T).toarray().ravel()
+    doc_shared = (doc_sq @ query_bin.T).toarray().ravel()
 
-    tfidf = TfidfVectorizer(
-        stop_words="english",
-        max_features=3000
+    query_norm = _UNIQUE_IDF_SQ * query_sq.sum() - (_UNIQUE_IDF_SQ - 1) * query_shared
+    doc_norm = (
+        _UNIQUE_IDF_SQ * np.asarray(doc_sq.sum(axis=1)).ravel()
+        - (_UNIQUE_IDF_SQ - 1) * doc_shared
     )
 
-    vectors = tfidf.fit_transform(texts)
+    denom = np.sqrt(query_norm * doc_norm)
+    return np.divide(dot, denom, out=np.zeros(n_docs), where=denom > 0)
+
+
+def calculate_match_scores(resume_text, job_descriptions):
+    """
+    Returns match percentages of one resume against many job descriptions
+    """
+    if not resume_text or not len(job_descriptions):
+        return np.zeros(len(job_descriptions))
 
-    score = cosine_similarity(vectors[0:1], vectors[1:])[0][0]
+    scores = pairwise_match_scores(
+        term_counts([resume_text]),
+        term_counts([d or "" for d in job_descriptions])
+    )
+    return np.round(scores * 100, 2)
+
+
+def top_matches(scores, top_n=5, threshold=0.0):
+    """
+    Indices of the top_n scores >= threshold, best first.
+    Uses argpartition, so only the winners are sorted.
+    """
+    candidates = np.flatnonzero(scores >= threshold)
+
+    if len(candidates) > top_n:
+        best = np.argpartition(-scores[candidates], top_n - 1)[:top_n]
+        candidates = candidates[best]
+
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def calculate_match_score(resume_pdf_path, job_description):
+    """
+    Returns match percentage between resume & job description
+    """
+
+    resume_text = get_resume_text(resume_pdf_path)
+
+    if not resume_text or not job_description:
+        return 0.0
 
-    return round(score * 100, 2)
+    return float(calculate_match_scores(resume_text, [job_description])[0])
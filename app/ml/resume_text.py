@@ -0,0 +1,112 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from app.ml.pdf_service import pdf_service
+
+
+# ===============================
+# CONFIG
+# ===============================
+# Parsed text lives outside app/static, keyed by the PDF's SHA-256
+RESUME_TEXT_DIR = "uploads/resume_text"
+STATIC_FOLDER = "app/static"
+LRU_SIZE = 256
+
+os.makedirs(RESUME_TEXT_DIR, exist_ok=True)
+
+
+def extract_text_from_pdf(pdf_path):
+    """
+    Parses the PDF in the bounded extraction pool (see pdf_service)
+    """
+    return pdf_service.extract(pdf_path)
+
+
+def resolve_resume_path(path):
+    """
+    Application.resume_file_path is stored as a static web path
+    ("uploads/resumes/..."); map it back to the file on disk
+    """
+    if not path:
+        return None
+    if os.path.exists(path):
+        return path
+
+    static_path = os.path.join(STATIC_FOLDER, path)
+    if os.path.exists(static_path):
+        return static_path
+
+    return None
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ===============================
+# CACHE (memory LRU → disk → parse)
+# ===============================
+_lru = OrderedDict()
+_lru_lock = threading.Lock()
+
+
+def _lru_get(key):
+    with _lru_lock:
+        if key not in _lru:
+            return None
+        _lru.move_to_end(key)
+        return _lru[key]
+
+
+def _lru_put(key, text):
+    with _lru_lock:
+        _lru[key] = text
+        _lru.move_to_end(key)
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+
+
+def _disk_path(digest):
+    return os.path.join(RESUME_TEXT_DIR, f"{digest}.txt")
+
+
+def get_resume_text(pdf_path):
+    """
+    Returns the text of a resume PDF, parsing each distinct file only once
+    """
+    path = resolve_resume_path(pdf_path)
+    if not path:
+        return ""
+
+    digest = file_sha256(path)
+
+    text = _lru_get(digest)
+    if text is not None:
+        return text
+
+    cached_path = _disk_path(digest)
+    if os.path.exists(cached_path):
+        with open(cached_path, encoding="utf-8") as f:
+            text = f.read()
+
+    # "" means the parse failed or timed out (or an old cache entry of
+    # one): never cache it, so the next read tries again
+    if not text:
+        text = extract_text_from_pdf(path)
+        if not text:
+            return ""
+
+        # Write-then-rename so concurrent workers never read a partial file
+        tmp_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, cached_path)
+
+    _lru_put(digest, text)
+    return text
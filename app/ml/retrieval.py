@@ -0,0 +1,42 @@
+import numpy as np
+
+from app.ml.resume_matcher import top_matches
+
+
+# Rows scored per block; bounds the dense score buffer to this many floats
+CHUNK_ROWS = 50_000
+
+
+def chunked_top_k(score_rows, n_rows, k, threshold=0.0, alive=None,
+                  chunk_rows=CHUNK_ROWS):
+    """
+    Top-k over n_rows scored block by block.
+
+    score_rows(start, end) must return a dense score array for that row
+    range. Each block is reduced to its own top-k with argpartition before
+    the next one is scored, so peak memory is one block plus k * blocks.
+
+    Returns (row indices, scores), best first.
+    """
+    if k <= 0 or n_rows == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+
+    rows = []
+    scores = []
+
+    for start in range(0, n_rows, chunk_rows):
+        end = min(start + chunk_rows, n_rows)
+        block = score_rows(start, end)
+
+        if alive is not None:
+            block = np.where(alive[start:end], block, -np.inf)
+
+        best = top_matches(block, top_n=k, threshold=threshold)
+        rows.append(best + start)
+        scores.append(block[best])
+
+    rows = np.concatenate(rows)
+    scores = np.concatenate(scores)
+
+    best = top_matches(scores, top_n=k, threshold=threshold)
+    return rows[best], scores[best]
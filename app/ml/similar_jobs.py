@@ -1,11 +1,31 @@
+import numpy as np
+from sqlalchemy import func
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
+from app import db
+from app.models import SimilarJob
+from app.ml.job_index import get_job_index
+from app.ml.resume_matcher import top_matches
+
+
+# Neighbours stored per job in the similar_jobs table
+SIMILAR_JOBS_K = 3
+
+# Rows scored at once when rebuilding the whole table
+REBUILD_CHUNK_SIZE = 128
+
 
 def find_similar_jobs(current_job, jobs, top_n=3):
-    texts = [current_job.description] + [
-        job.description for job in jobs if job.id != current_job.id
-    ]
+    """
+    Ad-hoc similarity over an explicit job list (refits TF-IDF).
+    The job detail page reads the precomputed similar_jobs table instead.
+    """
+    others = [job for job in jobs if job.id != current_job.id]
+    if not others:
+        return []
+
+    texts = [current_job.description] + [job.description for job in others]
 
     tfidf = TfidfVectorizer(stop_words="english")
     vectors = tfidf.fit_transform(texts)
@@ -13,9 +33,159 @@ def find_similar_jobs(current_job, jobs, top_n=3):
     similarities = cosine_similarity(vectors[0:1], vectors[1:])[0]
 
     ranked = sorted(
-        zip(jobs, similarities),
+        zip(others, similarities),
         key=lambda x: x[1],
         reverse=True
     )
 
     return ranked[:top_n]
+
+
+def _neighbor_rows(job_id, job_ids, scores):
+    best = top_matches(scores, top_n=SIMILAR_JOBS_K)
+    return [
+        {"job_id": job_id, "similar_job_id": int(other_id), "score": float(score)}
+        for other_id, score in zip(job_ids[best], scores[best])
+        if score > 0
+    ]
+
+
+def _recompute(index, job_ids):
+    if not job_ids:
+        return
+
+    SimilarJob.query.filter(SimilarJob.job_id.in_(job_ids)).delete(synchronize_session=False)
+
+    rows = []
+    for job_id in job_ids:
+        other_ids, scores = index.similar_to(job_id)
+        rows.extend(_neighbor_rows(job_id, other_ids, scores))
+
+    if rows:
+        db.session.execute(SimilarJob.__table__.insert(), rows)
+
+
+# ===============================
+# INCREMENTAL MAINTENANCE
+# ===============================
+def refresh_similar_jobs(job):
+    """
+    Call after a job create/edit has been committed and upserted into the
+    job index. Rewrites the job's own neighbours and patches the lists of
+    jobs it now enters (or leaves).
+    """
+    index = get_job_index()
+    other_ids, scores = index.similar_to(job.id)
+
+    # Jobs that listed this job were ranked against its old text
+    stale = {
+        row.job_id
+        for row in SimilarJob.query.filter_by(similar_job_id=job.id).all()
+    }
+    _recompute(index, sorted(stale | {job.id}))
+
+    # Other jobs whose top-k the job may now enter (cosine is symmetric):
+    # compared against each list's weakest score, read in one aggregate
+    weakest = {
+        job_id: (low, count)
+        for job_id, low, count in db.session.query(
+            SimilarJob.job_id, func.min(SimilarJob.score), func.count()
+        ).group_by(SimilarJob.job_id)
+    }
+    entering = {}
+    positive = scores > 0
+    for other_id, score in zip(other_ids[positive].tolist(), scores[positive].tolist()):
+        if other_id in stale:
+            continue
+        low, count = weakest.get(other_id, (0.0, 0))
+        if count < SIMILAR_JOBS_K or score > low:
+            entering[other_id] = score
+
+    # Usually a handful of jobs: only their rows are loaded and changed
+    current = {}
+    entering_ids = list(entering)
+    for start in range(0, len(entering_ids), 500):
+        chunk = entering_ids[start:start + 500]
+        for row in SimilarJob.query.filter(SimilarJob.job_id.in_(chunk)).all():
+            current.setdefault(row.job_id, []).append(row)
+
+    for other_id, score in entering.items():
+        neighbors = current.get(other_id, [])
+        if len(neighbors) >= SIMILAR_JOBS_K:
+            db.session.delete(min(neighbors, key=lambda r: r.score))
+        db.session.add(SimilarJob(
+            job_id=other_id,
+            similar_job_id=job.id,
+            score=score
+        ))
+
+    db.session.commit()
+
+
+def detach_similar_jobs(job_id):
+    """
+    Call before deleting a job (same transaction).
+    Returns the ids of jobs that lost it as a neighbour.
+    """
+    affected = [
+        row.job_id
+        for row in SimilarJob.query.filter_by(similar_job_id=job_id).all()
+    ]
+
+    SimilarJob.query.filter(
+        (SimilarJob.job_id == job_id) | (SimilarJob.similar_job_id == job_id)
+    ).delete(synchronize_session=False)
+
+    return affected
+
+
+def compute_similar_jobs(job_ids):
+    """
+    Writes the neighbour lists of these (indexed) jobs only, e.g. for
+    a batch of imported jobs. Same transaction as the caller.
+    """
+    _recompute(get_job_index(), list(job_ids))
+
+
+def backfill_similar_jobs(job_ids):
+    """
+    Call after a delete has been committed and removed from the job index
+    """
+    _recompute(get_job_index(), list(job_ids))
+    db.session.commit()
+
+
+# ===============================
+# FULL REBUILD
+# ===============================
+def rebuild_similar_jobs():
+    """
+    Recomputes the whole table from the job index, in row chunks so the
+    dense score block stays small. Returns the number of rows written.
+    """
+    index = get_job_index()
+
+    SimilarJob.query.delete(synchronize_session=False)
+
+    matrix = index.matrix
+    written = 0
+
+    if matrix is not None:
+        live_rows = np.flatnonzero(index.alive)
+        live_matrix = matrix[live_rows]
+        live_ids = index.job_ids[live_rows]
+
+        for start in range(0, len(live_rows), REBUILD_CHUNK_SIZE):
+            block = (live_matrix[start:start + REBUILD_CHUNK_SIZE] @ live_matrix.T).toarray()
+
+            rows = []
+            for offset, scores in enumerate(block):
+                scores[start + offset] = -1  # never a neighbour of itself
+                rows.extend(_neighbor_rows(int(live_ids[start + offset]), live_ids, scores))
+
+            if rows:
+                db.session.execute(SimilarJob.__table__.insert(), rows)
+                written += len(rows)
+
+    db.session.commit()
+    return written
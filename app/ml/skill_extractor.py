@@ -10,18 +10,94 @@ SKILL_KEYWORDS = [
     "docker", "git", "linux"
 ]
 
+# Alternative spellings → canonical skill in SKILL_KEYWORDS
+SKILL_SYNONYMS = {
+    "postgres": "postgresql",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "natural language processing": "nlp",
+    "html5": "html",
+    "css3": "css",
+    "js": "javascript",
+    "reactjs": "react",
+    "react.js": "react",
+}
 
-def extract_skills(text):
-    if not text:
-        return []
+# Matched (so "js" inside them isn't) but not skills of their own:
+# "." counts as a word boundary, so "node.js" would otherwise give JavaScript
+SKILL_IGNORED = ["node.js", "next.js"]
+
+
+def _trie_regex(terms):
+    """
+    Builds one alternation shaped like a prefix trie, so the regex engine
+    branches on each next character instead of trying every term in turn
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        ends_here = "" in node
+        branches = [
+            re.escape(ch) + build(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+
+        if not branches:
+            return ""
+
+        if len(branches) == 1 and not ends_here:
+            return branches[0]
+
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if ends_here else group
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """
+    Single-pass matcher over a skill dictionary (plus synonyms).
+    Matches whole words only; the longest term wins on overlap.
+    """
 
-    text = text.lower()
-    found = set()
+    def __init__(self, keywords, synonyms=None, ignored=()):
+        self.canonical = {kw.lower(): kw.title() for kw in keywords}
+        for alias, skill in (synonyms or {}).items():
+            self.canonical[alias.lower()] = skill.title()
+        for term in ignored:
+            self.canonical[term.lower()] = None
+
+        self.pattern = re.compile(
+            r"(?<!\w)" + _trie_regex(self.canonical) + r"(?!\w)"
+        )
+
+    def extract(self, text):
+        if not text:
+            return []
+
+        # Collapse line breaks so multi-word skills split across lines match
+        text = " ".join(text.lower().split())
+
+        found = {self.canonical[m.group(0)] for m in self.pattern.finditer(text)}
+        found.discard(None)
+        return sorted(found)
+
+
+_matcher = SkillMatcher(SKILL_KEYWORDS, SKILL_SYNONYMS, SKILL_IGNORED)
+
+
+def extract_skills(text):
+    return _matcher.extract(text)
 
-    for skill in SKILL_KEYWORDS:
-        # Word-boundary safe regex
-        pattern = rf"\b{re.escape(skill)}\b"
-        if re.search(pattern, text):
-            found.add(skill.title())
 
-    return sorted(found)
+def extract_skills_batch(texts):
+    """
+    Returns one sorted skill list per input text
+    """
+    return [_matcher.extract(text) for text in texts]
@@ -1,19 +1,19 @@
-import os
-from app.models import Application, Job
-from app.ml.recommender import recommend_jobs
+from app.models import Application, User
+from app.ml.recommendation_cache import recommended_jobs
+from app.ml.resume_text import resolve_resume_path
 
 
-def get_recommendations_for_user(user_id, limit=5):
+def get_recommendations_for_user(user_id, limit=5, threshold=0.0):
     """
-    Returns ML job recommendations for a user
+    Returns ML job recommendations for a user: the best `limit` jobs
+    by match %, served from the per-user recommendation cache
     """
 
-    # 🔹 Get latest application with resume
+    # 🔹 Get latest application with resume (pointer kept on the user)
+    user = User.query.get(user_id)
     latest_app = (
-        Application.query
-        .filter_by(seeker_user_id=user_id)
-        .order_by(Application.applied_at.desc())
-        .first()
+        Application.query.get(user.latest_resume_application_id)
+        if user and user.latest_resume_application_id else None
     )
 
     # ❌ No application or no resume
@@ -21,20 +21,13 @@ def get_recommendations_for_user(user_id, limit=5):
         return []
 
     # ❌ Resume file missing on disk
-    if not os.path.exists(latest_app.resume_file_path):
+    resume_path = resolve_resume_path(latest_app.resume_file_path)
+    if not resume_path:
         print("Resume file NOT FOUND:", latest_app.resume_file_path)
         return []
 
-    # 🔹 Get all jobs
-    jobs = Job.query.all()
-    if not jobs:
-        return []
-
-    # 🔹 ML Recommendation
-    recommendations = recommend_jobs(
-        latest_app.resume_file_path,
-        jobs,
-        top_n=limit
-    )
-
-    return recommendations
+    # 🔹 ML Recommendation (cached top-N, new jobs merged incrementally)
+    return [
+        {"job": job, "match_percent": score}
+        for job, score in recommended_jobs(user, resume_path, limit=limit, threshold=threshold)
+    ]
@@ -27,12 +27,28 @@ from app import db
 # ---------------------------------------------------------------------
 class User(db.Model):
     __tablename__ ='users'
+    __table_args__ = (
+        db.Index("ix_users_role_id", "user_type", "id"),           # admin list by role
+        db.Index("ix_users_email_norm", "email_normalized"),       # admin search (prefix)
+        db.Index("ix_users_name_norm", "name_normalized"),
+    )
 
     id = db.Column(db.Integer, primary_key=True,autoincrement=True)
     name = db.Column(db.String(120), nullable=False)
     email = db.Column(db.String(150), unique=True, nullable=False)
+
+    # Lowercased, accent-free copies for search (see app/user_search.py)
+    name_normalized = db.Column(db.String(120))
+    email_normalized = db.Column(db.String(150))
     password_hash = db.Column(db.String(255), nullable=False)
     user_type = db.Column(db.String(50), nullable=False, default="seeker") # admin, employer, seeker
+    auth_version = db.Column(db.Integer, nullable=False, default=0)  # bumped to revoke sessions
+
+    # Denormalized from applications (see app/user_counters.py)
+    application_count = db.Column(db.Integer, nullable=False, default=0)
+    latest_application_id = db.Column(db.Integer)
+    latest_resume_application_id = db.Column(db.Integer)
+    has_skills = db.Column(db.Boolean, nullable=False, default=False)  # latest application has skills
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
     companies = db.relationship("Company", backref="employer", lazy=True)
@@ -73,6 +89,12 @@ class Company(db.Model):
 # ---------------------------------------------------------------------
 class Job(db.Model):
     __tablename__ = "jobs"
+    __table_args__ = (
+        db.Index("ix_jobs_posted", "posted_at", "id"),                          # public list
+        db.Index("ix_jobs_poster_posted", "posted_by_user_id", "posted_at"),    # my jobs
+        db.Index("uq_jobs_source_external", "source", "external_id", unique=True),  # feed imports
+        db.Index("ix_jobs_index_version", "index_version"),                     # job index sync
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(180), nullable=False)
@@ -82,10 +104,18 @@ class Job(db.Model):
     job_type = db.Column(db.String(50))
     posted_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Partner feed the job was imported from (NULL for jobs posted on the site)
+    source = db.Column(db.String(80))
+    external_id = db.Column(db.String(120))
+
+    # "job_index" catalog version of the last insert/description edit (see app/ml/job_index.py)
+    index_version = db.Column(db.Integer, nullable=False, default=0)
+
     company_id = db.Column(db.Integer, db.ForeignKey("companies.id"), nullable=False)
     posted_by_user_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
 
-    applications = db.relationship("Application", backref="job", lazy=True)
+    applications = db.relationship("Application", backref="job", lazy=True,
+                                   cascade="all, delete-orphan")
     categories = db.relationship("JobCategory", secondary="job_skills",
                                  back_populates="jobs")
 # ---------------------------------------------------------------------
@@ -93,6 +123,11 @@ class Job(db.Model):
 # ---------------------------------------------------------------------
 class Application(db.Model):
     __tablename__ = "applications"
+    __table_args__ = (
+        db.Index("uq_applications_job_seeker", "job_id", "seeker_user_id", unique=True),  # one per job
+        db.Index("ix_applications_seeker_applied", "seeker_user_id", "applied_at"),       # my applications
+        db.Index("ix_applications_job_score", "job_id", "match_score"),                   # ranked applicants
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"), nullable=False)
@@ -102,7 +137,97 @@ class Application(db.Model):
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     # ✅ NEW (ML SCORE)
     match_score = db.Column(db.Float)  # percentage (0–100)
-    skills = db.Column(db.Text)  # comma-separated
+    skills = db.Column(db.Text)  # comma-separated (display copy of categories)
+    ml_status = db.Column(db.String(20), default="done")  # pending, done, failed
+
+    categories = db.relationship("JobCategory", secondary="application_skills",
+                                 back_populates="applications")
+
+
+# ---------------------------------------------------------------------
+# BACKGROUND TASKS (durable queue, see app/tasks.py)
+# ---------------------------------------------------------------------
+class BackgroundTask(db.Model):
+    __tablename__ = "background_tasks"
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text)  # JSON kwargs for the handler
+    status = db.Column(db.String(20), nullable=False, default="queued", index=True)  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    progress = db.Column(db.Integer, nullable=False, default=0)  # items done, see tasks.report_progress
+    total = db.Column(db.Integer)
+    failed = db.Column(db.Integer, nullable=False, default=0)  # of progress, items that failed
+    error = db.Column(db.Text)
+    run_after = db.Column(db.DateTime)  # retry backoff: not claimed before this
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)  # heartbeat while running
+
+
+# ---------------------------------------------------------------------
+# JOB FEED IMPORTS (checkpoint per input file, see app/job_import.py)
+# ---------------------------------------------------------------------
+class JobImport(db.Model):
+    __tablename__ = "job_imports"
+
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(80), nullable=False)
+    fingerprint = db.Column(db.String(64), nullable=False, index=True)  # sha1 of size + head of the file
+    path = db.Column(db.String(500))
+    status = db.Column(db.String(20), nullable=False, default="running")  # running, done, failed
+    rows_read = db.Column(db.Integer, nullable=False, default=0)  # committed input position
+    inserted = db.Column(db.Integer, nullable=False, default=0)
+    duplicates = db.Column(db.Integer, nullable=False, default=0)
+    rejected = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# ---------------------------------------------------------------------
+# RECOMMENDATION CACHE (see app/ml/recommendation_cache.py)
+# ---------------------------------------------------------------------
+class UserRecommendation(db.Model):
+    __tablename__ = "user_recommendations"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    resume_application_id = db.Column(db.Integer)     # resume the list was computed from
+    catalog_version = db.Column(db.Integer, nullable=False, default=0)
+    index_version = db.Column(db.Integer, nullable=False, default=0)  # jobs stamped above it are unscored
+    top_jobs = db.Column(db.Text, nullable=False)     # JSON [[job_id, match %], ...] best first
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class CatalogVersion(db.Model):
+    __tablename__ = "catalog_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+# ---------------------------------------------------------------------
+# ANALYTICS ROLLUPS (maintained on flush, see app/analytics.py)
+# ---------------------------------------------------------------------
+class AnalyticsRollup(db.Model):
+    __tablename__ = "analytics_rollups"
+
+    metric = db.Column(db.String(50), primary_key=True)   # users_by_role, skills, ...
+    key = db.Column(db.String(190), primary_key=True)     # role, company/job id, skill
+    label = db.Column(db.String(255))                     # display name (company, job title)
+    value = db.Column(db.Float, nullable=False, default=0)
+
+
+# ---------------------------------------------------------------------
+# SIMILAR JOBS (precomputed top-k neighbours, see app/ml/similar_jobs.py)
+# ---------------------------------------------------------------------
+class SimilarJob(db.Model):
+    __tablename__ = "similar_jobs"
+
+    job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"), primary_key=True)
+    similar_job_id = db.Column(db.Integer, db.ForeignKey("jobs.id"), primary_key=True, index=True)
+    score = db.Column(db.Float, nullable=False)  # cosine (0–1)
+
+    similar_job = db.relationship("Job", foreign_keys=[similar_job_id])
 
 
 # ---------------------------------------------------------------------
@@ -117,6 +242,9 @@ class JobCategory(db.Model):
     jobs = db.relationship("Job",
                            secondary="job_skills",
                            back_populates="categories")
+    applications = db.relationship("Application",
+                                   secondary="application_skills",
+                                   back_populates="categories")
 
 # ---------------------------------------------------------------------
 # JOB SKILL (Mapping Table)
@@ -130,6 +258,15 @@ class JobCategory(db.Model):
 job_skills = db.Table(
     "job_skills",
     db.Column("job_id", db.Integer, db.ForeignKey("jobs.id"), primary_key=True),
-    db.Column("category_id", db.Integer, db.ForeignKey("job_categories.id"), primary_key=True)
+    db.Column("category_id", db.Integer, db.ForeignKey("job_categories.id"), primary_key=True, index=True)
 )
 
+
+# ---------------------------------------------------------------------
+# APPLICATION SKILL (Mapping Table, skills found in the resume)
+# ---------------------------------------------------------------------
+application_skills = db.Table(
+    "application_skills",
+    db.Column("application_id", db.Integer, db.ForeignKey("applications.id"), primary_key=True),
+    db.Column("category_id", db.Integer, db.ForeignKey("job_categories.id"), primary_key=True, index=True)
+)
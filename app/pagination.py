@@ -0,0 +1,181 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import current_app, request, url_for
+from sqlalchemy import and_, false, or_, tuple_
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+# ===============================
+# CURSORS
+# ===============================
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values, direction, offset):
+    payload = {
+        "v": [_encode_value(v) for v in values],
+        "d": direction,
+        "o": offset,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Returns the cursor dict, or None for a missing/garbled cursor
+    (which simply means "first page")
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        payload["v"] = [_decode_value(v) for v in payload["v"]]
+        if payload["d"] not in ("next", "prev"):
+            return None
+        payload["o"] = max(int(payload.get("o", 0)), 0)
+        return payload
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        return None
+
+
+# ===============================
+# KEYSET PAGINATION
+# ===============================
+class KeysetPage:
+    def __init__(self, items, per_page, start, next_cursor, prev_cursor):
+        self.items = items
+        self.per_page = per_page
+        self.start = start              # offset of items[0], for numbering
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def _seek_condition(order_by, values, backward):
+    directions = {item[1] for item in order_by}
+    columns = [item[0] for item in order_by]
+    nullable = [len(item) > 2 and item[2] for item in order_by]
+
+    # "after" means smaller for DESC columns, larger for ASC ones
+    def after(direction):
+        return (direction == "desc") != backward
+
+    if len(directions) == 1 and not any(nullable):
+        # Row-value comparison lets the DB seek straight into the index
+        if after(directions.pop()):
+            return tuple_(*columns) < tuple_(*values)
+        return tuple_(*columns) > tuple_(*values)
+
+    def equal(column, value):
+        return column.is_(None) if value is None else column == value
+
+    def step(column, value, smaller, may_be_null):
+        # NULL sorts below every value (SQLite, MySQL): last in DESC order
+        if value is None:
+            return false() if smaller else column.isnot(None)
+        if smaller:
+            return or_(column < value, column.is_(None)) if may_be_null else column < value
+        return column > value
+
+    terms = []
+    for i, item in enumerate(order_by):
+        prefix = [equal(c, v) for c, v in zip(columns[:i], values[:i])]
+        terms.append(and_(*prefix, step(item[0], values[i], after(item[1]), nullable[i])))
+    return or_(*terms)
+
+
+def page_size(per_page=None):
+    if per_page is None:
+        per_page = request.args.get("per_page", type=int)
+    if not per_page:
+        per_page = current_app.config.get("PAGE_SIZE", DEFAULT_PAGE_SIZE)
+    return max(1, min(per_page, MAX_PAGE_SIZE))
+
+
+def keyset_paginate(query, order_by, key, cursor=None, per_page=None):
+    """
+    Seek-based pagination: every page is one indexed range scan of
+    per_page + 1 rows, however deep it is.
+
+    order_by: [(column, "asc" | "desc"), ...] ending in a unique column;
+              (column, direction, True) marks a column that may be NULL
+    key:      item -> tuple of the same column values
+    cursor:   opaque token from a previous page (defaults to ?cursor=)
+    """
+    per_page = page_size(per_page)
+    if cursor is None:
+        cursor = request.args.get("cursor")
+    state = decode_cursor(cursor)
+
+    if state and len(state["v"]) != len(order_by):
+        state = None
+
+    backward = bool(state) and state["d"] == "prev"
+
+    paged = query
+    if state:
+        paged = paged.filter(_seek_condition(order_by, state["v"], backward))
+
+    ordering = [
+        item[0].desc() if (item[1] == "desc") != backward else item[0].asc()
+        for item in order_by
+    ]
+    rows = paged.order_by(*ordering).limit(per_page + 1).all()
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    if state and not rows:
+        # Cursor points past the data (rows deleted meanwhile): restart
+        return keyset_paginate(query, order_by, key, cursor="", per_page=per_page)
+
+    if backward:
+        rows.reverse()
+        start = max(state["o"] - len(rows), 0)
+        has_next, has_prev = True, has_more
+    else:
+        start = state["o"] if state else 0
+        has_next, has_prev = has_more, state is not None
+
+    next_cursor = encode_cursor(key(rows[-1]), "next", start + len(rows)) if has_next and rows else None
+    prev_cursor = encode_cursor(key(rows[0]), "prev", start) if has_prev and rows else None
+
+    return KeysetPage(rows, per_page, start, next_cursor, prev_cursor)
+
+
+def page_url(cursor):
+    """
+    Template helper: current URL with ?cursor= swapped
+    """
+    args = request.args.to_dict()
+    args["cursor"] = cursor
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+
+def init_app(app):
+    app.config.setdefault("PAGE_SIZE", DEFAULT_PAGE_SIZE)
+    app.add_template_global(page_url)
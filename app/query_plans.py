@@ -0,0 +1,173 @@
+"""
+EXPLAIN checks for the hot query paths.
+
+Each entry is a representative statement plus the indexes it may use;
+check_query_plans() runs EXPLAIN on the current database and reports
+any query whose plan uses other indexes than these (or a table scan),
+or that sorts its rows instead of reading them in index order.
+
+    flask --app run check-query-plans
+"""
+import re
+
+import sqlalchemy as sa
+
+from app import db
+from app.models import Job, Application, User, application_skills
+from app.pagination import _seek_condition
+
+
+def hot_queries():
+    """
+    Returns [(name, statement, the index names its plan must use)]
+
+    "PRIMARY" is a composite primary key (MySQL's name; SQLite's
+    sqlite_autoindex_* of the key is reported under it).
+    """
+    return [
+        (
+            "my applications",
+            sa.select(Application.id)
+            .where(Application.seeker_user_id == 1)
+            .order_by(Application.applied_at.desc(), Application.id.desc())
+            .limit(21),
+            {"ix_applications_seeker_applied"},
+        ),
+        (
+            "ranked applicants",
+            sa.select(Application.id)
+            .where(Application.job_id == 1)
+            .order_by(Application.match_score.desc(), Application.id.desc())
+            .limit(21),
+            # (job_id, match_score) plus the implicit id suffix: no sort step
+            {"ix_applications_job_score"},
+        ),
+        (
+            "ranked applicants, next page",
+            sa.select(Application.id)
+            .where(Application.job_id == 1, _seek_condition(
+                [(Application.match_score, "desc", True), (Application.id, "desc")], [50.0, 10], False
+            ))
+            .order_by(Application.match_score.desc(), Application.id.desc())
+            .limit(21),
+            {"ix_applications_job_score"},
+        ),
+        (
+            "duplicate application check",
+            sa.select(Application.id)
+            .where(Application.job_id == 1, Application.seeker_user_id == 1)
+            .limit(1),
+            {"uq_applications_job_seeker"},
+        ),
+        (
+            "my jobs",
+            sa.select(Job.id)
+            .where(Job.posted_by_user_id == 1)
+            .order_by(Job.posted_at.desc()),
+            {"ix_jobs_poster_posted"},
+        ),
+        (
+            "public job list",
+            sa.select(Job.id)
+            .order_by(Job.posted_at.desc(), Job.id.desc())
+            .limit(21),
+            {"ix_jobs_posted"},
+        ),
+        (
+            "top skills",
+            sa.select(application_skills.c.category_id, sa.func.count())
+            .group_by(application_skills.c.category_id),
+            {"ix_application_skills_category_id"},
+        ),
+        (
+            "applicants with a skill",
+            sa.select(Application.id)
+            .join(application_skills, application_skills.c.application_id == Application.id)
+            .where(Application.job_id == 1, application_skills.c.category_id == 1)
+            .order_by(Application.match_score.desc(), Application.id.desc())
+            .limit(21),
+            # Ranked applicants in index order, each probed by the
+            # (application_id, category_id) primary key: no sort step
+            {"ix_applications_job_score", "PRIMARY"},
+        ),
+        (
+            "users by role",
+            sa.select(User.id)
+            .where(User.user_type == "job_seeker", User.id > 1)
+            .order_by(User.id)
+            .limit(11),
+            {"ix_users_role_id"},
+        ),
+        (
+            "user email prefix",
+            sa.select(User.id)
+            .where(User.email_normalized >= "jo", User.email_normalized < "jp"),
+            {"ix_users_email_norm"},
+        ),
+        (
+            "user name prefix",
+            sa.select(User.id)
+            .where(User.name_normalized >= "jo", User.name_normalized < "jp"),
+            {"ix_users_name_norm"},
+        ),
+    ]
+
+
+# ===============================
+# EXPLAIN (per dialect)
+# ===============================
+_SQLITE_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+_SORT_STEP = re.compile(r"USE TEMP B-TREE|Using filesort")
+
+
+def _sqlite_index_name(conn, name):
+    """
+    Autoindexes backing a primary key are reported as "PRIMARY"
+    """
+    match = re.fullmatch(r"sqlite_autoindex_(\w+)_\d+", name)
+    if match:
+        origins = conn.execute(sa.text(f"PRAGMA index_list({match.group(1)})")).all()
+        if any(row[1] == name and row[3] == "pk" for row in origins):
+            return "PRIMARY"
+    return name
+
+
+def _used_indexes(conn, statement):
+    """
+    Returns (index names used, raw plan lines)
+    """
+    sql = str(statement.compile(conn, compile_kwargs={"literal_binds": True}))
+    dialect = conn.dialect.name
+
+    if dialect == "sqlite":
+        rows = conn.execute(sa.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        plan = [row[-1] for row in rows]
+        used = {_sqlite_index_name(conn, m.group(1)) for line in plan for m in _SQLITE_INDEX.finditer(line)}
+    elif dialect in ("mysql", "mariadb"):
+        rows = conn.execute(sa.text(f"EXPLAIN {sql}")).mappings().all()
+        plan = [f"{row['table']}: type={row['type']} key={row['key']} extra={row['Extra']}" for row in rows]
+        used = {row["key"] for row in rows if row["key"]}
+    else:
+        raise NotImplementedError(f"No EXPLAIN parser for {dialect}")
+
+    return used, plan
+
+
+def check_query_plans(engine=None):
+    """
+    Returns [{"name", "ok", "used", "expected", "plan"}] for every hot query
+    """
+    engine = engine or db.engine
+    results = []
+    with engine.connect() as conn:
+        for name, statement, expected in hot_queries():
+            used, plan = _used_indexes(conn, statement)
+            sorts = any(_SORT_STEP.search(line) for line in plan)
+            results.append({
+                "name": name,
+                "ok": used == expected and not sorts,
+                "used": sorted(used),
+                "expected": sorted(expected),
+                "plan": plan,
+            })
+    return results
@@ -4,12 +4,16 @@ import os
 from datetime import datetime
 
 from app import db
-from app.models import Application, Job
+from app.models import Application, Job, JobCategory, application_skills
 from app.routes.auth import login_required, role_required
+from app.pagination import keyset_paginate
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
-from app.ml.resume_matcher import calculate_match_score
-from app.ml.recommender import extract_text_from_pdf
-from app.ml.skill_extractor import extract_skills
+from app.tasks import enqueue, active_task
+from app.user_counters import record_application
+from app.ml.recommendation_cache import invalidate_recommendations
 
 
 applications_bp = Blueprint("applications", __name__, url_prefix="/applications")
@@ -79,35 +83,36 @@ def apply_job(job_id):
 
     resume.save(saved_path)
 
-    # ===============================
-    # ML PROCESSING
-    # ===============================
-    match_score = calculate_match_score(
-        saved_path,
-        job.description
-    )
-
-    resume_text = extract_text_from_pdf(saved_path)
-    skills = extract_skills(resume_text)
-
     # ===============================
     # SAVE APPLICATION
     # ===============================
     # Store WEB path (ALWAYS with /)
+    # ML scoring + skill extraction run in the background worker
     web_path = f"uploads/resumes/{saved_filename}"
     application = Application(
         job_id=job_id,
         seeker_user_id=user_id,
         resume_file_path=web_path,
-        match_score=match_score,
-        skills=", ".join(skills)
+        ml_status="pending"
     )
 
     db.session.add(application)
+    try:
+        db.session.flush()
+    except IntegrityError:
+        # Lost a race with a concurrent submit (uq_applications_job_seeker)
+        db.session.rollback()
+        os.remove(saved_path)
+        flash("You have already applied for this job.", "warning")
+        return redirect(url_for("jobs.job_detail", job_id=job_id))
+
+    record_application(application)
+    invalidate_recommendations(user_id)     # new resume
+    enqueue("score_application", application_id=application.id)
     db.session.commit()
 
     flash(
-        f"Application submitted successfully! Match score: {match_score}%",
+        "Application submitted successfully! Your match score will appear shortly.",
         "success"
     )
 
@@ -125,16 +130,18 @@ def apply_job(job_id):
 @login_required
 @role_required("job_seeker","employee")
 def my_applications():
-    applications = (
+    page = keyset_paginate(
         Application.query
         .filter_by(seeker_user_id=session["user_id"])
-        .order_by(Application.applied_at.desc())
-        .all()
+        .options(joinedload(Application.job).joinedload(Job.company)),
+        order_by=[(Application.applied_at, "desc"), (Application.id, "desc")],
+        key=lambda app: (app.applied_at, app.id)
     )
 
     return render_template(
         "applications.html",
-        applications=applications
+        applications=page.items,
+        page=page
     )
 
 
@@ -151,15 +158,45 @@ def view_job_applications(job_id):
         flash("You do not have permission to view applications.", "danger")
         return redirect(url_for("jobs.my_jobs"))
 
-    applications = (
+    selected_skill = request.args.get("skill")
+
+    # 🔥 Skill facet for this job's applicants (application_skills)
+    skill_counts = dict(
+        db.session.query(JobCategory.name, func.count(application_skills.c.application_id))
+        .join(application_skills, application_skills.c.category_id == JobCategory.id)
+        .join(Application, Application.id == application_skills.c.application_id)
+        .filter(Application.job_id == job_id)
+        .group_by(JobCategory.id, JobCategory.name)
+        .order_by(JobCategory.name)
+        .all()
+    )
+
+    query = (
         Application.query
         .filter_by(job_id=job_id)
-        .order_by(Application.match_score.desc())  # 🔥 ML RANKING
-        .all()
+        .options(joinedload(Application.seeker))
+    )
+    if selected_skill:
+        query = (
+            query
+            .join(application_skills, application_skills.c.application_id == Application.id)
+            .join(JobCategory, JobCategory.id == application_skills.c.category_id)
+            .filter(JobCategory.name == selected_skill)
+        )
+
+    # 🔥 ML RANKING (pending/unscored rows sort last: NULL is lowest in DESC)
+    page = keyset_paginate(
+        query,
+        order_by=[(Application.match_score, "desc", True), (Application.id, "desc")],
+        key=lambda app: (app.match_score, app.id)
     )
 
     return render_template(
         "job_applications.html",
         job=job,
-        applications=applications
+        applications=page.items,
+        page=page,
+        skill_counts=skill_counts,
+        selected_skill=selected_skill,
+        rescoring=active_task("rescore_job", job_id=job_id)
     )
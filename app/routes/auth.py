@@ -1,7 +1,8 @@
 
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash
+from flask import Blueprint, render_template, request, redirect, url_for, session, flash, g, current_app, abort
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
+import time
 from app import db
 from app.models import User   # absolute import (safe)
 # =========================
@@ -31,6 +32,85 @@ def home():
 def ping():
     return "AUTH BLUEPRINT WORKING"
 
+# =========================
+# Current User (once per request)
+# =========================
+def get_current_user():
+    """
+    The logged-in User, loaded at most once per request and kept on g
+    so decorators and views share it. A session whose user row is gone
+    (deleted while its stamp was still trusted) is cleared and the
+    request redirected to login.
+    """
+    if "current_user" not in g:
+        user_id = session.get("user_id")
+        g.current_user = User.query.get(user_id) if user_id else None
+        if user_id and g.current_user is None:
+            session.clear()
+            flash("Session expired. Please login again.", "danger")
+            abort(redirect(url_for("auth.login")))
+    return g.current_user
+
+
+# =========================
+# Session Stamp (optional, AUTH_STAMP_TTL)
+# =========================
+
+def stamp_session(user):
+    """
+    Writes the identity into the (signed) session cookie. With
+    AUTH_STAMP_TTL > 0 the role check trusts the stamp until it expires.
+    """
+    session["user_id"] = user.id
+    session["user_type"] = user.user_type
+    session["auth_version"] = user.auth_version or 0
+
+    ttl = current_app.config.get("AUTH_STAMP_TTL", 0)
+    if ttl:
+        session["auth_stamp"] = {
+            "role": user.user_type,
+            "v": user.auth_version or 0,
+            "exp": int(time.time()) + ttl,
+        }
+
+
+def revoke_sessions(user):
+    """
+    Logs the user out everywhere (suspension, role or password change):
+    at once with AUTH_STAMP_TTL = 0, else once their stamps expire.
+    Commit afterwards.
+    """
+    user.auth_version = (user.auth_version or 0) + 1
+
+
+def _stamped_role():
+    stamp = session.get("auth_stamp")
+    if not stamp or not current_app.config.get("AUTH_STAMP_TTL", 0):
+        return None
+    if stamp["exp"] < time.time():
+        return None
+    return stamp["role"]
+
+
+def _session_role():
+    """
+    Role of a still-valid session (stamp or DB auth_version check), or
+    None after clearing a revoked one. Shared by both decorators.
+    """
+    role = _stamped_role()
+    if role is not None:
+        return role
+
+    user = get_current_user()
+    if not user or (user.auth_version or 0) != session.get("auth_version", 0):
+        session.clear()
+        return None
+
+    if current_app.config.get("AUTH_STAMP_TTL", 0):
+        stamp_session(user)     # (re)issue the stamp
+    return user.user_type
+
+
 # =========================
 # Login Required Decorator
 # =========================
@@ -40,6 +120,11 @@ def login_required(view):
         if "user_id" not in session:
             flash("Please login first", "warning")
             return redirect(url_for("auth.login"))
+
+        if _session_role() is None:
+            flash("Session expired. Please login again.", "danger")
+            return redirect(url_for("auth.login"))
+
         return view(*args, **kwargs)
     return wrapped
 
@@ -55,15 +140,14 @@ def role_required(*roles):
                 flash("Please login first", "warning")
                 return redirect(url_for("auth.login"))
 
-            user = User.query.get(session.get("user_id"))
+            role = _session_role()
 
-            if not user:
-                session.clear()
+            if role is None:
                 flash("Session expired. Please login again.", "danger")
                 return redirect(url_for("auth.login"))
 
             # ✅ MULTI-ROLE CHECK
-            if user.user_type not in roles:
+            if role not in roles:
                 flash("Access denied.", "danger")
                 return redirect(url_for("auth.login"))
 
@@ -98,8 +182,7 @@ def login():
             return redirect(url_for("auth.login"))
 
         session.clear()
-        session["user_id"] = user.id
-        session["user_type"] = user.user_type
+        stamp_session(user)
 
         flash("Login successful", "success")
 
@@ -2,6 +2,8 @@ from flask import Blueprint, render_template, request, redirect, flash, session,
 from app.models import Company, User
 from app import db
 from app.routes.auth import role_required, login_required
+from app.pagination import keyset_paginate
+from app.cache import cached_view
 company_bp = Blueprint("company", __name__, url_prefix="/companies")
 
 
@@ -9,9 +11,14 @@ company_bp = Blueprint("company", __name__, url_prefix="/companies")
 # LIST ALL COMPANIES (PUBLIC)
 # =========================
 @company_bp.route("/")
+@cached_view(depends_on=("companies",), ttl=300)
 def companies_list():
-    companies = Company.query.all()
-    return render_template("companies.html", companies=companies)
+    page = keyset_paginate(
+        Company.query,
+        order_by=[(Company.id, "asc")],
+        key=lambda company: (company.id,)
+    )
+    return render_template("companies.html", companies=page.items, page=page)
 
 
 # =========================
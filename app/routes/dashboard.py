@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, session
-from app.routes.auth import login_required, role_required
+from app.routes.auth import login_required, role_required, get_current_user
 from app.models import User
 dashboard_bp = Blueprint("dashboard", __name__)
 
@@ -33,10 +33,7 @@ PERMISSIONS = {
 
 # Helper: Get logged-in user
 def current_user():
-    uid = session.get("user_id")
-    if not uid:
-        return None
-    return User.query.get(uid)
+    return get_current_user()
 
 # =========================
 # ADMIN DASHBOARD
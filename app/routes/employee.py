@@ -1,6 +1,8 @@
 from flask import Blueprint, render_template, session
+from sqlalchemy.orm import joinedload
 from app.models import User, Job, Application
-from app.routes.auth import login_required, role_required
+from app.routes.auth import login_required, role_required, get_current_user
+from app.pagination import keyset_paginate
 
 employee_bp = Blueprint("employee", __name__, url_prefix="/employee")
 
@@ -12,17 +14,16 @@ employee_bp = Blueprint("employee", __name__, url_prefix="/employee")
 @login_required
 @role_required("employee")
 def dashboard():
-    user = User.query.get(session.get("user_id"))
+    user = get_current_user()
 
-    # ✅ Correct: COUNT only
-    applied_count = Application.query.filter_by(
-        seeker_user_id=user.id
-    ).count()
+    # ✅ Denormalized counter, no COUNT query
+    applied_count = user.application_count
 
     # ✅ Recent 5 applications
     recent_applications = (
         Application.query
         .filter_by(seeker_user_id=user.id)
+        .options(joinedload(Application.job).joinedload(Job.company))
         .order_by(Application.applied_at.desc())
         .limit(5)
         .all()
@@ -45,14 +46,16 @@ def dashboard():
 def applied_jobs():
     user_id = session.get("user_id")
 
-    applications = (
+    page = keyset_paginate(
         Application.query
-        .filter_by(seeker_user_id=user_id)   # ✅ FIXED
-        .order_by(Application.applied_at.desc())
-        .all()
+        .filter_by(seeker_user_id=user_id)                     # ✅ FIXED
+        .options(joinedload(Application.job).joinedload(Job.company)),
+        order_by=[(Application.applied_at, "desc"), (Application.id, "desc")],
+        key=lambda app: (app.applied_at, app.id)
     )
 
     return render_template(
         "employee/applied_jobs.html",
-        applications=applications
+        applications=page.items,
+        page=page
     )
@@ -2,10 +2,19 @@ from flask import Blueprint, render_template, request, redirect, flash, session,
 from werkzeug.utils import secure_filename
 import os
 from datetime import datetime
-from app.ml.similar_jobs import find_similar_jobs
+from app.ml.similar_jobs import refresh_similar_jobs, detach_similar_jobs, backfill_similar_jobs
+from app.ml import job_index
 from app import db
-from app.models import Job, Company,User
+from app.models import Job, Company, User, SimilarJob, JobCategory, job_skills
+from app.ml.job_skills import sync_job_skills
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 from app.routes.auth import role_required, login_required
+from app.pagination import keyset_paginate, page_size
+from app.search import search_jobs
+from app.cache import cached_view
+from app.user_counters import refresh_user_counters
+from app.tasks import enqueue
 
 jobs_bp = Blueprint("jobs", __name__, url_prefix="/jobs")
 
@@ -16,49 +25,83 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 
 
-# LIST ALL JOBS (PUBLIC)
-from app.ml.skill_extractor import extract_skills
+def _owner_vary():
+    # Only the owning business sees edit controls; other visitors of a role share a page
+    user_type = session.get("user_type")
+    return (user_type, session.get("user_id") if user_type == "business" else None)
+
 
+# LIST ALL JOBS (PUBLIC)
 @jobs_bp.route("/")
+@cached_view(depends_on=("jobs", "companies"), ttl=300)
 def jobs_list():
     selected_skill = request.args.get("skill")
 
-    all_jobs = Job.query.all()
-
-    # 🔥 Collect skills dynamically from job descriptions
-    skill_set = set()
-    for job in all_jobs:
-        if job.description:
-            skills = extract_skills(job.description)
-            skill_set.update(skills)
+    # 🔥 Skill facet from job_skills (filled when jobs are saved)
+    skill_rows = (
+        db.session.query(JobCategory.name, func.count(job_skills.c.job_id))
+        .join(job_skills, job_skills.c.category_id == JobCategory.id)
+        .group_by(JobCategory.id, JobCategory.name)
+        .order_by(JobCategory.name)
+        .all()
+    )
 
-    skills = sorted(skill_set)
+    skills = [name for name, _ in skill_rows]
+    skill_counts = dict(skill_rows)
 
-    # 🔎 Filter jobs if skill selected
+    # 🔎 Filter jobs if skill selected (company joined in: the cards show its name)
+    query = Job.query.options(joinedload(Job.company))
     if selected_skill:
-        jobs = [
-            job for job in all_jobs
-            if job.description and
-               selected_skill.lower() in job.description.lower()
-        ]
-    else:
-        jobs = all_jobs
+        query = (
+            query
+            .join(job_skills, job_skills.c.job_id == Job.id)
+            .join(JobCategory, JobCategory.id == job_skills.c.category_id)
+            .filter(JobCategory.name == selected_skill)
+        )
+
+    page = keyset_paginate(
+        query,
+        order_by=[(Job.posted_at, "desc"), (Job.id, "desc")],
+        key=lambda job: (job.posted_at, job.id)
+    )
 
     return render_template(
         "jobs.html",
-        jobs=jobs,
+        jobs=page.items,
+        page=page,
         skills=skills,              # ✅ consistent name
+        skill_counts=skill_counts,
         selected_skill=selected_skill
     )
 
 
 
+# FULL-TEXT SEARCH (PUBLIC)
+@jobs_bp.route("/search")
+@cached_view(depends_on=("jobs", "companies"), ttl=120)
+def search():
+    q = request.args.get("q", "").strip()
+    page = request.args.get("page", 1, type=int)
+
+    results = search_jobs(q, page=page, per_page=page_size())
+
+    return render_template("jobs_search.html", q=q, results=results)
+
+
 @jobs_bp.route("/<int:job_id>")
+@cached_view(depends_on=("jobs", "companies"), ttl=300, vary=_owner_vary)
 def job_detail(job_id):
-    job = Job.query.get_or_404(job_id)
-    all_jobs = Job.query.all()
-
-    similar_jobs = find_similar_jobs(job, all_jobs)
+    job = Job.query.options(joinedload(Job.company)).get_or_404(job_id)
+
+    # 🔥 Precomputed neighbours (one indexed lookup, no refit)
+    similar_jobs = (
+        db.session.query(Job, SimilarJob.score)
+        .join(SimilarJob, SimilarJob.similar_job_id == Job.id)
+        .filter(SimilarJob.job_id == job.id)
+        .options(joinedload(Job.company))
+        .order_by(SimilarJob.score.desc())
+        .all()
+    )
 
     return render_template(
         "job_detail.html",
@@ -108,8 +151,11 @@ def create_job():
             posted_by_user_id=session["user_id"]
         )
 
+        sync_job_skills(job)
         db.session.add(job)
         db.session.commit()
+        job_index.upsert_job(job)
+        refresh_similar_jobs(job)
 
         flash("Job posted successfully!", "success")
         return redirect(url_for("jobs.jobs_list"))
@@ -132,6 +178,7 @@ def edit_job(job_id):
     companies = Company.query.filter_by(employer_user_id=session["user_id"]).all()
 
     if request.method == "POST":
+        old_description = job.description
         job.title = request.form.get("title")
         job.description = request.form.get("description")
         job.salary_range = request.form.get("salary")
@@ -146,8 +193,15 @@ def edit_job(job_id):
             return redirect(url_for("jobs.edit_job", job_id=job.id))
 
         job.company_id = company.id
+        sync_job_skills(job)
+
+        # Stored match scores were computed against the old text
+        if job.description != old_description:
+            enqueue("rescore_job", job_id=job.id)
 
         db.session.commit()
+        job_index.upsert_job(job)
+        refresh_similar_jobs(job)
         flash("Job updated successfully.", "success")
         return redirect(url_for("jobs.my_jobs"))
 
@@ -167,8 +221,14 @@ def delete_job(job_id):
         return redirect(url_for("jobs.my_jobs"))
 
     if request.method == "POST":
-        db.session.delete(job)
+        affected = detach_similar_jobs(job_id)
+        applicants = {application.seeker_user_id for application in job.applications}
+        db.session.delete(job)     # cascades to its applications
+        db.session.flush()
+        refresh_user_counters(db.session.connection(), applicants)
         db.session.commit()
+        job_index.remove_job(job_id)
+        backfill_similar_jobs(affected)
         flash("Job deleted.", "success")
         return redirect(url_for("jobs.my_jobs"))
 
@@ -181,5 +241,11 @@ def delete_job(job_id):
 @login_required
 @role_required("business")
 def my_jobs():
-    jobs = Job.query.filter_by(posted_by_user_id=session["user_id"]).order_by(Job.posted_at.desc()).all()
+    jobs = (
+        Job.query
+        .filter_by(posted_by_user_id=session["user_id"])
+        .options(joinedload(Job.company))
+        .order_by(Job.posted_at.desc())
+        .all()
+    )
     return render_template("my_jobs.html", jobs=jobs)
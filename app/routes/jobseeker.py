@@ -1,20 +1,19 @@
 from flask import Blueprint, render_template, session
 from app.models import User
-from app.routes.auth import login_required, role_required
+from app.routes.auth import login_required, role_required, get_current_user
 from app.ml.utils import get_recommendations_for_user
 
 jobseeker_bp = Blueprint("jobseeker", __name__, url_prefix="/jobseeker")
 
 
-import os
-from app.models import Application, Job,User
-from app.ml.resume_matcher import calculate_match_score
+from app.models import Application, User
+from app.ml.resume_text import resolve_resume_path
 
 @jobseeker_bp.route("/dashboard")
 @login_required
 @role_required("job_seeker")
 def dashboard():
-    user = User.query.get(session.get("user_id"))
+    user = get_current_user()
 
     # =========================
     # PROFILE STATUS (REAL)
@@ -29,18 +28,16 @@ def dashboard():
     # RESUME STATUS (REAL FILE CHECK)
     # =========================
     latest_application = (
-        Application.query
-        .filter_by(seeker_user_id=user.id)
-        .order_by(Application.applied_at.desc())
-        .first()
+        Application.query.get(user.latest_resume_application_id)
+        if user.latest_resume_application_id else None
     )
 
     resume_uploaded = False
     resume_path = None
 
     if latest_application and latest_application.resume_file_path:
-        resume_path = latest_application.resume_file_path
-        resume_uploaded = os.path.exists(resume_path)
+        resume_path = resolve_resume_path(latest_application.resume_file_path)
+        resume_uploaded = resume_path is not None
 
     # =========================
     # ML ENGINE STATUS
@@ -53,26 +50,8 @@ def dashboard():
     recommendations = []
 
     if ml_enabled:
-        jobs = Job.query.all()
-
-        for job in jobs:
-            score = calculate_match_score(
-                resume_path,
-                job.description
-            )
-
-            if score >= 40:
-                recommendations.append({
-                    "job": job,
-                    "match_percent": score
-                })
-
-        recommendations.sort(
-            key=lambda x: x["match_percent"],
-            reverse=True
-        )
-
-        recommendations = recommendations[:5]
+        # Cached per user; only new jobs are scored between resume uploads
+        recommendations = get_recommendations_for_user(user.id, limit=5, threshold=40)
 
     return render_template(
         "dashboards/jobseeker_dashboard.html",
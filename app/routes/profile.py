@@ -2,21 +2,18 @@ from flask import Blueprint, render_template, session, request, redirect, flash,
 from werkzeug.utils import secure_filename
 from app import db
 from app.models import User, Application
-from app.routes.auth import login_required
+from app.routes.auth import login_required, get_current_user, revoke_sessions, stamp_session
+from app.images import check_upload, queue_photo
 import os
-import uuid
 
 profile_bp = Blueprint("profile", __name__, url_prefix="/profile")
 
 # ============================
 # CONFIG
 # ============================
-UPLOAD_FOLDER = "app/static/uploads/profile_pics"
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg"}
 MAX_FILE_SIZE = 2 * 1024 * 1024  # 2MB
 
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
 
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -35,12 +32,11 @@ def calculate_profile_score(user):
     if user.profile_image:
         score += 20
 
-    applications = Application.query.filter_by(seeker_user_id=user.id).all()
-    if applications:
+    # Counters kept on the user row (app/user_counters.py)
+    if user.application_count:
         score += 30
 
-        latest_app = applications[-1]
-        if latest_app.skills:
+        if user.has_skills:
             score += 30
 
     return score
@@ -52,7 +48,7 @@ def calculate_profile_score(user):
 @profile_bp.route("/")
 @login_required
 def my_profile():
-    user = User.query.get(session.get("user_id"))
+    user = get_current_user()
 
     profile_score = calculate_profile_score(user)
 
@@ -69,7 +65,7 @@ def my_profile():
 @profile_bp.route("/change-password", methods=["GET", "POST"])
 @login_required
 def change_password():
-    user = User.query.get(session.get("user_id"))
+    user = get_current_user()
 
     if request.method == "POST":
         old_password = request.form.get("old")
@@ -80,7 +76,9 @@ def change_password():
             return redirect(request.url)
 
         user.set_password(new_password)
+        revoke_sessions(user)
         db.session.commit()
+        stamp_session(user)     # keep this session, drop the others
 
         flash("Password updated successfully!", "success")
         return redirect(url_for("profile.my_profile"))
@@ -94,7 +92,7 @@ def change_password():
 @profile_bp.route("/edit", methods=["GET", "POST"])
 @login_required
 def edit_profile():
-    user = User.query.get(session.get("user_id"))
+    user = get_current_user()
 
     if request.method == "POST":
         user.name = request.form.get("name")
@@ -113,7 +111,7 @@ def edit_profile():
 @profile_bp.route("/upload-photo", methods=["POST"])
 @login_required
 def upload_photo():
-    user = User.query.get(session.get("user_id"))
+    user = get_current_user()
 
     if "photo" not in request.files:
         flash("No file selected.", "danger")
@@ -138,14 +136,15 @@ def upload_photo():
         flash("Image must be under 2MB.", "danger")
         return redirect(url_for("profile.my_profile"))
 
-    ext = photo.filename.rsplit(".", 1)[1].lower()
-    filename = f"{uuid.uuid4().hex}.{ext}"
-
-    photo.save(os.path.join(UPLOAD_FOLDER, filename))
+    error = check_upload(photo.stream)
+    if error:
+        flash(error, "danger")
+        return redirect(url_for("profile.my_profile"))
 
-    # ✅ Save only filename in DB
-    user.profile_image = filename
+    # Thumbnails are made in the background (app/images.py); the new
+    # photo replaces user.profile_image once they are ready
+    queue_photo(user, photo)
     db.session.commit()
 
-    flash("Profile photo updated!", "success")
+    flash("Profile photo uploaded! It will appear in a few seconds.", "success")
     return redirect(url_for("profile.my_profile"))
@@ -1,7 +1,9 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
-from app.routes.auth import login_required, role_required
+from app.routes.auth import login_required, role_required, revoke_sessions
 from app.models import User
 from app import db
+from app.pagination import keyset_paginate
+from app.user_search import user_search_filter
 from werkzeug.security import generate_password_hash
 
 users_bp = Blueprint("users", __name__, url_prefix="/users")
@@ -16,23 +18,26 @@ users_bp = Blueprint("users", __name__, url_prefix="/users")
 def users_list():
     search = request.args.get("search")
     role = request.args.get("role")
-    page = request.args.get("page", 1, type=int)
 
     query = User.query
 
-    # SEARCH USER
+    # SEARCH USER (prefix / n-gram indexes, see app/user_search.py)
     if search:
-        query = query.filter(
-            User.name.ilike(f"%{search}%") |
-            User.email.ilike(f"%{search}%")
-        )
+        condition = user_search_filter(search)
+        if condition is not None:
+            query = query.filter(condition)
 
-    # FILTER BY ROLE
+    # FILTER BY ROLE (ix_users_role_id)
     if role and role != "all":
         query = query.filter_by(user_type=role)
 
-    # PAGINATION (10 per page)
-    users_page = query.paginate(page=page, per_page=10)
+    # PAGINATION (10 per page, keyset on id)
+    users_page = keyset_paginate(
+        query,
+        order_by=[(User.id, "asc")],
+        key=lambda u: (u.id,),
+        per_page=10,
+    )
 
     return render_template("users.html",
                            users=users_page.items,
@@ -64,7 +69,10 @@ def edit_user(user_id):
     if request.method == "POST":
         user.name = request.form["name"]
         user.email = request.form["email"]
-        user.user_type = request.form["user_type"]
+
+        if user.user_type != request.form["user_type"]:
+            user.user_type = request.form["user_type"]
+            revoke_sessions(user)
 
         db.session.commit()
         flash("User updated successfully!", "success")
@@ -86,6 +94,7 @@ def delete_user(user_id):
         return redirect(url_for("users.users_list"))
 
     user = User.query.get_or_404(user_id)
+    revoke_sessions(user)
     db.session.delete(user)
     db.session.commit()
 
@@ -102,6 +111,7 @@ def delete_user(user_id):
 def suspend_user(user_id):
     user = User.query.get_or_404(user_id)
     user.user_type = "suspended"
+    revoke_sessions(user)
 
     db.session.commit()
     flash("User suspended!", "warning")
@@ -119,6 +129,7 @@ def activate_user(user_id):
 
     if user.user_type == "suspended":
         user.user_type = "job_seeker"
+        revoke_sessions(user)
 
     db.session.commit()
     flash("User activated!", "success")
@@ -136,6 +147,7 @@ def reset_user_password(user_id):
 
     new_pass = request.form.get("new_password")
     user.password_hash = generate_password_hash(new_pass)
+    revoke_sessions(user)
 
     db.session.commit()
     flash("Password reset successfully!", "success")
@@ -0,0 +1,277 @@
+"""
+Full-text job search.
+
+job_search mirrors each job's title, description, location and company
+name. It is a FULLTEXT-indexed InnoDB table on MySQL and an FTS5 virtual
+table on SQLite (dev/tests). Session events keep it in step with job and
+company writes, inside the same transaction.
+
+Query syntax: plain words (all must match), "quoted phrases" and
+prefix* terms. Results are ranked by relevance, title matches first.
+"""
+import math
+import re
+
+import sqlalchemy as sa
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, joinedload
+
+from app import db
+from app.models import Job, Company
+
+
+MAX_TERMS = 10
+MAX_PAGES = 50          # deep pages of a relevance ranking are never useful
+TITLE_WEIGHT = 10.0     # FTS5 bm25 column weights: title, description, location, company
+COLUMN_WEIGHTS = (TITLE_WEIGHT, 1.0, 2.0, 2.0)
+
+_INDEXED = {"title", "description", "location", "company_id"}
+
+
+# ===============================
+# TABLE (per dialect)
+# ===============================
+def _dialect(conn):
+    return "mysql" if conn.dialect.name in ("mysql", "mariadb") else conn.dialect.name
+
+
+def _key(conn):
+    return "job_id" if _dialect(conn) == "mysql" else "rowid"
+
+
+def create_search_table(conn):
+    dialect = _dialect(conn)
+    if dialect == "sqlite":
+        conn.execute(sa.text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS job_search USING fts5("
+            "title, description, location, company, tokenize = 'porter unicode61')"
+        ))
+    elif dialect == "mysql":
+        conn.execute(sa.text(
+            "CREATE TABLE IF NOT EXISTS job_search ("
+            " job_id INTEGER PRIMARY KEY,"
+            " title VARCHAR(180), description TEXT, location VARCHAR(150), company VARCHAR(180),"
+            " FULLTEXT KEY ft_job_search (title, description, location, company),"
+            " FULLTEXT KEY ft_job_search_title (title)"
+            ") ENGINE=InnoDB"
+        ))
+    else:
+        raise RuntimeError(f"No full-text search for {conn.dialect.name} (see create_app)")
+
+
+@event.listens_for(Job.__table__, "after_create")
+def _create_with_jobs(target, conn, **kw):
+    """
+    db.create_all() builds job_search too, so the flush hook below
+    always has its table (migrations create it in v0010)
+    """
+    if _dialect(conn) in ("sqlite", "mysql"):
+        create_search_table(conn)
+
+
+# ===============================
+# INDEXER
+# ===============================
+def _source(where):
+    return (
+        "SELECT jobs.id, jobs.title, jobs.description, jobs.location, companies.name "
+        "FROM jobs JOIN companies ON companies.id = jobs.company_id " + where
+    )
+
+
+def _insert(conn, where="", **params):
+    conn.execute(
+        sa.text(
+            f"INSERT INTO job_search ({_key(conn)}, title, description, location, company) "
+            + _source(where)
+        ).bindparams(*[sa.bindparam(name, expanding=True) for name in params]),
+        params,
+    )
+
+
+def remove_jobs(conn, job_ids):
+    if job_ids:
+        conn.execute(
+            sa.text(f"DELETE FROM job_search WHERE {_key(conn)} IN :ids")
+            .bindparams(sa.bindparam("ids", expanding=True)),
+            {"ids": list(job_ids)},
+        )
+
+
+def index_jobs(conn, job_ids):
+    """
+    (Re)writes the search rows of these jobs from the jobs table
+    """
+    job_ids = list(job_ids)
+    if job_ids:
+        remove_jobs(conn, job_ids)
+        _insert(conn, "WHERE jobs.id IN :ids", ids=job_ids)
+
+
+def index_companies(conn, company_ids):
+    """
+    Re-indexes every job of these companies (company name changed)
+    """
+    job_ids = [
+        row[0] for row in conn.execute(
+            sa.select(Job.id).where(Job.company_id.in_(list(company_ids)))
+        )
+    ]
+    index_jobs(conn, job_ids)
+
+
+def reindex_all(conn):
+    conn.execute(sa.text("DELETE FROM job_search"))
+    _insert(conn)
+    return conn.execute(sa.text("SELECT COUNT(*) FROM job_search")).scalar()
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search(session, flush_context):
+    jobs, removed, companies = set(), set(), set()
+
+    for obj in session.new:
+        if isinstance(obj, Job):
+            jobs.add(obj.id)
+
+    for obj in session.dirty:
+        if obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if isinstance(obj, Job):
+            if any(state.attrs[a].history.has_changes() for a in _INDEXED):
+                jobs.add(obj.id)
+        elif isinstance(obj, Company):
+            if state.attrs["name"].history.has_changes():
+                companies.add(obj.id)
+
+    for obj in session.deleted:
+        if isinstance(obj, Job):
+            removed.add(obj.id)
+
+    if not (jobs or removed or companies):
+        return
+
+    conn = session.connection()
+    remove_jobs(conn, removed)
+    index_jobs(conn, jobs - removed)
+    if companies:
+        index_companies(conn, companies)
+
+
+# ===============================
+# QUERY
+# ===============================
+_TOKENS = re.compile(r'"([^"]*)"|(\S+)')
+_WORD = re.compile(r"\w+")
+
+
+def parse_query(text):
+    """
+    Returns [(kind, words)] with kind "phrase", "prefix" or "term"
+    """
+    parts = []
+    for phrase, token in _TOKENS.findall(text or ""):
+        if phrase:
+            words = _WORD.findall(phrase)
+            if len(words) > 1:
+                parts.append(("phrase", words))
+            elif words:
+                parts.append(("term", words))
+            continue
+
+        words = _WORD.findall(token)
+        if not words:
+            continue
+        parts.extend(("term", [word]) for word in words[:-1])
+        parts.append(("prefix" if token.endswith("*") else "term", words[-1:]))
+
+    return parts[:MAX_TERMS]
+
+
+def _fts5_expression(parts):
+    out = []
+    for kind, words in parts:
+        quoted = '"' + " ".join(words).replace('"', '""') + '"'
+        out.append(quoted + "*" if kind == "prefix" else quoted)
+    return " ".join(out)
+
+
+def _boolean_expression(parts):
+    out = []
+    for kind, words in parts:
+        if kind == "phrase":
+            out.append('+"' + " ".join(words) + '"')
+        elif kind == "prefix":
+            out.append("+" + words[0] + "*")
+        else:
+            out.append("+" + words[0])
+    return " ".join(out)
+
+
+def _ranked_ids(conn, parts, limit, offset):
+    """
+    Returns (total, [(job_id, score)]) for one page
+    """
+    if _dialect(conn) == "sqlite":
+        params = {"q": _fts5_expression(parts), "limit": limit, "offset": offset}
+        weights = ", ".join(str(w) for w in COLUMN_WEIGHTS)
+        total = conn.execute(
+            sa.text("SELECT COUNT(*) FROM job_search WHERE job_search MATCH :q"), params
+        ).scalar()
+        rows = conn.execute(sa.text(
+            f"SELECT rowid, -bm25(job_search, {weights}) AS score FROM job_search "
+            "WHERE job_search MATCH :q ORDER BY score DESC, rowid DESC "
+            "LIMIT :limit OFFSET :offset"
+        ), params).all()
+    else:
+        params = {"q": _boolean_expression(parts), "limit": limit, "offset": offset}
+        match = "MATCH(title, description, location, company) AGAINST (:q IN BOOLEAN MODE)"
+        total = conn.execute(
+            sa.text(f"SELECT COUNT(*) FROM job_search WHERE {match}"), params
+        ).scalar()
+        rows = conn.execute(sa.text(
+            f"SELECT job_id, {match} + {TITLE_WEIGHT} * MATCH(title) AGAINST (:q IN BOOLEAN MODE) AS score "
+            f"FROM job_search WHERE {match} ORDER BY score DESC, job_id DESC "
+            "LIMIT :limit OFFSET :offset"
+        ), params).all()
+
+    return total, [(row[0], float(row[1])) for row in rows]
+
+
+class SearchPage:
+    def __init__(self, query, results, total, page, per_page):
+        self.query = query
+        self.results = results          # [(job, score)]
+        self.total = total
+        self.page = page
+        self.per_page = per_page
+        self.pages = min(math.ceil(total / per_page), MAX_PAGES) if total else 0
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def has_next(self):
+        return self.page < self.pages
+
+
+def search_jobs(text, page=1, per_page=20):
+    parts = parse_query(text)
+    page = max(1, min(page, MAX_PAGES))
+    if not parts:
+        return SearchPage(text, [], 0, page, per_page)
+
+    conn = db.session.connection()
+    total, ranked = _ranked_ids(conn, parts, per_page, (page - 1) * per_page)
+
+    jobs_by_id = {
+        job.id: job
+        for job in Job.query
+        .filter(Job.id.in_([job_id for job_id, _ in ranked]))
+        .options(joinedload(Job.company))
+    } if ranked else {}
+
+    results = [(jobs_by_id[job_id], score) for job_id, score in ranked if job_id in jobs_by_id]
+    return SearchPage(text, results, total, page, per_page)
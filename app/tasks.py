@@ -0,0 +1,279 @@
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import BackgroundTask
+
+
+# ===============================
+# HANDLER REGISTRY
+# ===============================
+_handlers = {}
+_current = threading.local()    # task being run by this worker thread
+
+
+def task_handler(kind, max_attempts=3, on_failure=None):
+    """
+    Registers fn(**payload) as the worker for tasks of this kind.
+    on_failure(**payload) runs once the last attempt has failed.
+    """
+    def decorator(fn):
+        _handlers[kind] = {
+            "run": fn,
+            "max_attempts": max_attempts,
+            "on_failure": on_failure,
+        }
+        return fn
+    return decorator
+
+
+def enqueue(kind, **payload):
+    """
+    Adds a task row to the current session. It is handed to the worker
+    pool only once the surrounding transaction commits.
+    """
+    task = BackgroundTask(kind=kind, payload=json.dumps(payload))
+    db.session.add(task)
+    return task
+
+
+def report_progress(done, total=None, failed=None):
+    """
+    Called from a handler: records how far the running task got, and how
+    many of those items failed (and heartbeats it, see heartbeat).
+    Written with the handler's session, so it becomes visible on its
+    next commit.
+    """
+    task_id = getattr(_current, "task_id", None)
+    if task_id is None:
+        return
+    values = {"progress": done, "updated_at": datetime.utcnow()}
+    if total is not None:
+        values["total"] = total
+    if failed is not None:
+        values["failed"] = failed
+    BackgroundTask.query.filter_by(id=task_id).update(values, synchronize_session=False)
+
+
+def heartbeat():
+    """
+    Called from long handlers, between commits: a running task whose
+    updated_at is older than TASK_LEASE_SECONDS counts as abandoned and
+    is re-queued by recover()
+    """
+    task_id = getattr(_current, "task_id", None)
+    if task_id is None:
+        return
+    BackgroundTask.query.filter_by(id=task_id).update(
+        {"updated_at": datetime.utcnow()}, synchronize_session=False
+    )
+
+
+def retry_delay(attempts):
+    """
+    Seconds before the next attempt: doubles per failed attempt
+    """
+    from flask import current_app
+
+    return current_app.config["TASK_RETRY_DELAY"] * 2 ** max(attempts - 1, 0)
+
+
+def active_task(kind, **payload):
+    """
+    Latest queued or running task of this kind with exactly this payload
+    """
+    return (
+        BackgroundTask.query
+        .filter(
+            BackgroundTask.kind == kind,
+            BackgroundTask.payload == json.dumps(payload),
+            BackgroundTask.status.in_(["queued", "running"]),
+        )
+        .order_by(BackgroundTask.id.desc())
+        .first()
+    )
+
+
+# ===============================
+# QUEUE (thread pool + DB table)
+# ===============================
+class TaskQueue:
+    """
+    In-process worker pool backed by the background_tasks table, so
+    queued work survives restarts (see recover()).
+    """
+
+    def __init__(self):
+        self.app = None
+        self.executor = None
+        self._next_recovery = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        app.config.setdefault("TASK_WORKERS", int(os.getenv("TASK_WORKERS", 2)))
+        # A running task not heartbeating for this long is re-queued
+        app.config.setdefault("TASK_LEASE_SECONDS", int(os.getenv("TASK_LEASE_SECONDS", 300)))
+        app.config.setdefault("TASK_RETRY_DELAY", int(os.getenv("TASK_RETRY_DELAY", 10)))
+        self.app = app
+        app.extensions["task_queue"] = self
+
+        # Recover on requests rather than at import time, so processes
+        # that only import the app (CLI, spawned workers) don't; then
+        # again once per lease, for tasks of workers that died since
+        @app.before_request
+        def _recover_when_due():
+            if time.monotonic() < self._next_recovery:
+                return
+            with self._lock:
+                if time.monotonic() < self._next_recovery:
+                    return
+                self._next_recovery = time.monotonic() + app.config["TASK_LEASE_SECONDS"]
+            self.recover()
+
+    def _get_executor(self):
+        with self._lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.app.config["TASK_WORKERS"],
+                    thread_name_prefix="task"
+                )
+            return self.executor
+
+    def dispatch(self, task_id, delay=0):
+        if self.app is None:
+            return
+        if delay > 0:
+            # A little late rather than early: the claim checks run_after
+            timer = threading.Timer(delay + 0.5, self.dispatch, args=(task_id,))
+            timer.daemon = True
+            timer.start()
+            return
+        self._get_executor().submit(self._run, task_id)
+
+    def recover(self):
+        """
+        Re-queues running tasks whose lease expired (their worker died)
+        and dispatches every queued task, honouring retry backoff. Runs
+        on a process's first request, then once per lease.
+        """
+        now = datetime.utcnow()
+        lease = timedelta(seconds=self.app.config["TASK_LEASE_SECONDS"])
+        try:
+            # Tasks still heartbeating belong to live workers (maybe another process)
+            BackgroundTask.query.filter(
+                BackgroundTask.status == "running",
+                BackgroundTask.updated_at < now - lease,
+            ).update({"status": "queued", "updated_at": now}, synchronize_session=False)
+            db.session.commit()
+            tasks = (
+                BackgroundTask.query
+                .filter_by(status="queued")
+                .order_by(BackgroundTask.id)
+                .with_entities(BackgroundTask.id, BackgroundTask.run_after)
+                .all()
+            )
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print("Task recovery skipped:", e)
+            return 0
+
+        for task_id, run_after in tasks:
+            delay = (run_after - now).total_seconds() if run_after else 0
+            self.dispatch(task_id, delay=delay)
+        return len(tasks)
+
+    def _run(self, task_id):
+        with self.app.app_context():
+            # Claim atomically: another worker/process may hold the same id
+            now = datetime.utcnow()
+            claimed = BackgroundTask.query.filter(
+                BackgroundTask.id == task_id,
+                BackgroundTask.status == "queued",
+                (BackgroundTask.run_after.is_(None)) | (BackgroundTask.run_after <= now),
+            ).update({
+                "status": "running",
+                "attempts": BackgroundTask.attempts + 1,
+                "updated_at": now,
+            }, synchronize_session=False)
+            db.session.commit()
+
+            if not claimed:
+                return
+
+            task = BackgroundTask.query.get(task_id)
+            handler = _handlers.get(task.kind)
+            payload = json.loads(task.payload or "{}")
+
+            _current.task_id = task_id
+            try:
+                if handler is None:
+                    raise LookupError(f"No handler for task kind {task.kind!r}")
+                handler["run"](**payload)
+            except Exception:
+                db.session.rollback()
+                self._fail(task_id, handler, payload, traceback.format_exc())
+                return
+            finally:
+                _current.task_id = None
+
+            task = BackgroundTask.query.get(task_id)
+            task.status = "done"
+            task.error = None
+            task.updated_at = datetime.utcnow()
+            db.session.commit()
+
+    def _fail(self, task_id, handler, payload, error):
+        print("Task failed:", task_id, error)
+
+        task = BackgroundTask.query.get(task_id)
+        max_attempts = handler["max_attempts"] if handler else 1
+        retry = task.attempts < max_attempts
+
+        delay = retry_delay(task.attempts)
+        task.status = "queued" if retry else "failed"
+        task.error = error[-4000:]
+        task.updated_at = datetime.utcnow()
+        task.run_after = task.updated_at + timedelta(seconds=delay) if retry else None
+        db.session.commit()
+
+        if retry:
+            self.dispatch(task_id, delay=delay)
+        elif handler and handler["on_failure"]:
+            try:
+                handler["on_failure"](**payload)
+            except Exception as e:
+                db.session.rollback()
+                print("Task on_failure error:", task_id, e)
+
+
+task_queue = TaskQueue()
+
+
+# ===============================
+# DISPATCH ON COMMIT
+# ===============================
+@event.listens_for(Session, "after_flush")
+def _collect_new_tasks(session, flush_context):
+    for obj in session.new:
+        if isinstance(obj, BackgroundTask):
+            session.info.setdefault("new_tasks", []).append(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_new_tasks(session):
+    for task_id in session.info.pop("new_tasks", []):
+        task_queue.dispatch(task_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_new_tasks(session):
+    session.info.pop("new_tasks", None)
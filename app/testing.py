@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import db
+
+
+# ===============================
+# SQL STATEMENT COUNTING
+# ===============================
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(app):
+    """
+    Records every SQL statement the app's engine runs inside the block
+    """
+    with app.app_context():
+        engine = db.engine
+
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter._record)
+
+
+@contextmanager
+def assert_max_queries(app, max_queries):
+    """
+    Fails when the block issues more than max_queries statements,
+    so an N+1 sneaking into a list view shows up in tests:
+
+        with assert_max_queries(app, 6):
+            client.get("/applications/my")
+    """
+    with count_queries(app) as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(counter.statements, 1))
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, got {counter.count}:\n{listing}"
+        )
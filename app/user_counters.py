@@ -0,0 +1,98 @@
+"""
+Per-user application counters kept on the users row, so profile and
+dashboard pages don't scan a user's application history:
+
+    application_count             applications made
+    latest_application_id         newest application
+    latest_resume_application_id  newest application with a resume file
+    has_skills                    newest application has extracted skills
+"""
+from sqlalchemy import case, func, select, update
+
+from app import db
+from app.models import User, Application
+
+
+_users = User.__table__
+_applications = Application.__table__
+
+
+def _newer(column, application_id):
+    return case(
+        (column.is_(None), application_id),
+        (column < application_id, application_id),
+        else_=column,
+    )
+
+
+def record_application(application):
+    """
+    Call once the new application is flushed (it needs its id)
+    """
+    is_latest = func.coalesce(_users.c.latest_application_id, 0) < application.id
+    values = {
+        "application_count": _users.c.application_count + 1,
+        "latest_application_id": _newer(_users.c.latest_application_id, application.id),
+        "has_skills": case((is_latest, bool(application.skills)), else_=_users.c.has_skills),
+    }
+    if application.resume_file_path:
+        values["latest_resume_application_id"] = _newer(
+            _users.c.latest_resume_application_id, application.id
+        )
+
+    db.session.execute(
+        update(_users).where(_users.c.id == application.seeker_user_id).values(**values)
+    )
+
+
+def record_skills(application):
+    """
+    Call after skills are (re)extracted for an application
+    """
+    db.session.execute(
+        update(_users)
+        .where(
+            _users.c.id == application.seeker_user_id,
+            _users.c.latest_application_id == application.id,
+        )
+        .values(has_skills=bool(application.skills))
+    )
+
+
+def refresh_user_counters(conn, user_ids=None):
+    """
+    Recomputes the counters from applications (after deletes, or for all
+    users when user_ids is None)
+    """
+    owned = _applications.c.seeker_user_id == _users.c.id
+
+    recount = update(_users).values(
+        application_count=select(func.count()).where(owned).scalar_subquery(),
+        latest_application_id=select(func.max(_applications.c.id)).where(owned).scalar_subquery(),
+        latest_resume_application_id=(
+            select(func.max(_applications.c.id))
+            .where(owned, _applications.c.resume_file_path.isnot(None))
+            .scalar_subquery()
+        ),
+    )
+    skills = update(_users).values(
+        has_skills=(
+            select(_applications.c.id)
+            .where(
+                _applications.c.id == _users.c.latest_application_id,
+                _applications.c.skills.isnot(None),
+                _applications.c.skills != "",
+            )
+            .exists()
+        )
+    )
+
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return
+        recount = recount.where(_users.c.id.in_(user_ids))
+        skills = skills.where(_users.c.id.in_(user_ids))
+
+    conn.execute(recount)
+    conn.execute(skills)
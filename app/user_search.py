@@ -0,0 +1,213 @@
+"""
+Admin user search that stays index-backed at millions of users.
+
+users.name_normalized / users.email_normalized hold lowercased,
+accent-free copies of name and email (filled on every flush). Short
+queries are prefix lookups on their indexes, turned into plain ranges
+(`'jo' <= x < 'jp'`) so every dialect seeks instead of scanning.
+
+Queries of MIN_INFIX characters or more match anywhere in the name or
+email through user_search, an n-gram index: an FTS5 trigram table on
+SQLite, a FULLTEXT index WITH PARSER ngram on MySQL.
+"""
+import re
+import unicodedata
+
+import sqlalchemy as sa
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import User
+
+
+MIN_INFIX = 3           # trigram index: shorter queries are prefix-only
+BACKFILL_BATCH = 5000
+
+_SPACES = re.compile(r"\s+")
+_users = User.__table__
+
+
+# ===============================
+# NORMALIZATION
+# ===============================
+def normalize_name(text):
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", text).strip().casefold()
+
+
+def normalize_email(text):
+    return (text or "").strip().casefold()
+
+
+@event.listens_for(Session, "before_flush")
+def _normalize_users(session, flush_context, instances):
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, User):
+            obj.name_normalized = normalize_name(obj.name)
+            obj.email_normalized = normalize_email(obj.email)
+
+
+def backfill_normalized(conn):
+    """
+    Fills the normalized columns of every user, in id batches
+    """
+    last_id, updated = 0, 0
+    while True:
+        rows = conn.execute(
+            sa.select(_users.c.id, _users.c.name, _users.c.email)
+            .where(_users.c.id > last_id)
+            .order_by(_users.c.id)
+            .limit(BACKFILL_BATCH)
+        ).all()
+        if not rows:
+            return updated
+
+        conn.execute(
+            _users.update()
+            .where(_users.c.id == sa.bindparam("uid"))
+            .values(name_normalized=sa.bindparam("name_n"), email_normalized=sa.bindparam("email_n")),
+            [{"uid": r.id, "name_n": normalize_name(r.name), "email_n": normalize_email(r.email)} for r in rows],
+        )
+        last_id = rows[-1].id
+        updated += len(rows)
+
+
+# ===============================
+# N-GRAM TABLE (per dialect)
+# ===============================
+def _dialect(conn):
+    return "mysql" if conn.dialect.name in ("mysql", "mariadb") else conn.dialect.name
+
+
+def _key(conn):
+    return "user_id" if _dialect(conn) == "mysql" else "rowid"
+
+
+def create_user_search_table(conn):
+    dialect = _dialect(conn)
+    if dialect == "sqlite":
+        conn.execute(sa.text(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS user_search USING fts5("
+            "name, email, tokenize = 'trigram')"
+        ))
+    elif dialect == "mysql":
+        conn.execute(sa.text(
+            "CREATE TABLE IF NOT EXISTS user_search ("
+            " user_id INTEGER PRIMARY KEY,"
+            " name VARCHAR(120), email VARCHAR(150),"
+            " FULLTEXT KEY ft_user_search (name, email) WITH PARSER ngram"
+            ") ENGINE=InnoDB"
+        ))
+    else:
+        raise RuntimeError(f"No n-gram search for {conn.dialect.name} (see create_app)")
+
+
+@event.listens_for(User.__table__, "after_create")
+def _create_with_users(target, conn, **kw):
+    """
+    db.create_all() builds user_search too (migrations create it in v0011)
+    """
+    if _dialect(conn) in ("sqlite", "mysql"):
+        create_user_search_table(conn)
+
+
+def _insert(conn, where="", **params):
+    conn.execute(
+        sa.text(
+            f"INSERT INTO user_search ({_key(conn)}, name, email) "
+            "SELECT id, name_normalized, email_normalized FROM users " + where
+        ).bindparams(*[sa.bindparam(name, expanding=True) for name in params]),
+        params,
+    )
+
+
+def remove_users(conn, user_ids):
+    if user_ids:
+        conn.execute(
+            sa.text(f"DELETE FROM user_search WHERE {_key(conn)} IN :ids")
+            .bindparams(sa.bindparam("ids", expanding=True)),
+            {"ids": list(user_ids)},
+        )
+
+
+def index_users(conn, user_ids):
+    user_ids = list(user_ids)
+    if user_ids:
+        remove_users(conn, user_ids)
+        _insert(conn, "WHERE id IN :ids", ids=user_ids)
+
+
+def reindex_users(conn):
+    conn.execute(sa.text("DELETE FROM user_search"))
+    _insert(conn)
+    return conn.execute(sa.text("SELECT COUNT(*) FROM user_search")).scalar()
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_user_search(session, flush_context):
+    changed, removed = set(), set()
+
+    for obj in session.new:
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+    for obj in session.dirty:
+        if isinstance(obj, User) and obj not in session.deleted:
+            state = inspect(obj)
+            if any(state.attrs[a].history.has_changes() for a in ("name", "email")):
+                changed.add(obj.id)
+
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            removed.add(obj.id)
+
+    if changed or removed:
+        conn = session.connection()
+        remove_users(conn, removed)
+        index_users(conn, changed - removed)
+
+
+# ===============================
+# QUERY
+# ===============================
+def _prefix_range(column, prefix):
+    """
+    column LIKE 'prefix%' as a range every index can seek into
+    """
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return sa.and_(column >= prefix, column < upper)
+
+
+def _infix_ids(dialect, text):
+    if dialect == "mysql":
+        phrase = '"' + re.sub(r'["+\-<>()~*@]', " ", text).strip() + '"'
+        return sa.text(
+            "SELECT user_id FROM user_search "
+            "WHERE MATCH(name, email) AGAINST (:q IN BOOLEAN MODE)"
+        ).bindparams(q=phrase).columns(user_id=sa.Integer)
+
+    phrase = '"' + text.replace('"', '""') + '"'
+    return sa.text(
+        "SELECT rowid FROM user_search WHERE user_search MATCH :q"
+    ).bindparams(q=phrase).columns(rowid=sa.Integer)
+
+
+def user_search_filter(text):
+    """
+    Returns a condition on User.id for the search text, or None when
+    there is nothing to search for
+    """
+    text = normalize_name(text)
+    if not text:
+        return None
+
+    if len(text) >= MIN_INFIX:
+        return User.id.in_(_infix_ids(_dialect(db.engine), text))
+
+    prefix = sa.union(
+        sa.select(User.id).where(_prefix_range(User.email_normalized, text)),
+        sa.select(User.id).where(_prefix_range(User.name_normalized, text)),
+    )
+    return User.id.in_(prefix)
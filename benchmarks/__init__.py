@@ -0,0 +1,5 @@
+"""
+Micro-benchmarks for the ML helpers in app/ml.
+
+Run a module directly, e.g. `python -m benchmarks.skill_extractor`.
+"""
@@ -0,0 +1,69 @@
+"""
+Compare two benchmarks.run JSON results.
+
+Exits with status 1 when any function's p50 or p99 latency grew by more
+than --threshold (default 10%), so it can gate CI.
+
+    python -m benchmarks.compare results/abc123-1000-....json results/def456-1000-....json
+"""
+import argparse
+import json
+import sys
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _change(old, new):
+    if not old:
+        return None
+    return (new - old) / old
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    baseline = _load(args.baseline)
+    candidate = _load(args.candidate)
+
+    for key in ("jobs", "resumes", "seed"):
+        if baseline["meta"].get(key) != candidate["meta"].get(key):
+            print(f"warning: {key} differs "
+                  f"({baseline['meta'].get(key)} vs {candidate['meta'].get(key)})")
+
+    print(f"{baseline['meta']['commit']} -> {candidate['meta']['commit']}\n")
+    print(f"{'function':<24} {'p50':>9} {'p99':>9} {'ops/s':>9} {'peak MB':>9}")
+
+    regressions = []
+    for name, new in candidate["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            print(f"{name:<24} {'(new)':>9}")
+            continue
+
+        p50 = _change(old["p50_ms"], new["p50_ms"])
+        p99 = _change(old["p99_ms"], new["p99_ms"])
+        ops = _change(old["throughput_per_s"], new["throughput_per_s"])
+        rss = _change(old["peak_rss_mb"], new["peak_rss_mb"])
+
+        def fmt(value):
+            return f"{value:+.1%}" if value is not None else "n/a"
+
+        print(f"{name:<24} {fmt(p50):>9} {fmt(p99):>9} {fmt(ops):>9} {fmt(rss):>9}")
+
+        if any(v is not None and v > args.threshold for v in (p50, p99)):
+            regressions.append(name)
+
+    if regressions:
+        print(f"\nRegressed beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Deterministic synthetic corpus: job descriptions, resume texts and
+minimal text-layer resume PDFs.
+"""
+import os
+import random
+
+from app.ml.skill_extractor import SKILL_KEYWORDS
+
+
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+}
+
+ROLES = [
+    "backend developer", "frontend engineer", "data scientist",
+    "machine learning engineer", "devops engineer", "data analyst",
+    "full stack developer", "qa engineer", "platform engineer",
+]
+
+FILLER = [
+    "experience", "team", "build", "maintain", "scalable", "services",
+    "customers", "product", "design", "collaborate", "deliver", "quality",
+    "years", "strong", "knowledge", "communication", "ownership", "agile",
+    "cloud", "testing", "performance", "security", "mentoring", "roadmap",
+    "stakeholders", "analytics", "pipelines", "reliable", "features",
+]
+
+CITIES = ["Pune", "Bangalore", "Remote", "Mumbai", "Hyderabad", "Delhi"]
+
+
+def _paragraph(rng, n_words, skill_rate=0.12):
+    words = [
+        rng.choice(SKILL_KEYWORDS) if rng.random() < skill_rate else rng.choice(FILLER)
+        for _ in range(n_words)
+    ]
+    return " ".join(words)
+
+
+def job_descriptions(n, seed=0, words=(60, 180)):
+    """
+    Returns [(job_id, title, description, location)] for n synthetic jobs
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for job_id in range(1, n + 1):
+        role = rng.choice(ROLES)
+        description = f"We are hiring a {role}. " + _paragraph(rng, rng.randint(*words))
+        jobs.append((job_id, role.title(), description, rng.choice(CITIES)))
+    return jobs
+
+
+def resume_texts(n, seed=1, words=(250, 600)):
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(ROLES).title()} resume. " + _paragraph(rng, rng.randint(*words), 0.2)
+        for _ in range(n)
+    ]
+
+
+# ===============================
+# PDF WRITER (text layer only)
+# ===============================
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path, text, chars_per_line=90, lines_per_page=60):
+    """
+    Writes a plain Helvetica PDF that pdfplumber/pdfium can extract
+    """
+    words = text.split()
+    lines, current = [], ""
+    for word in words:
+        if current and len(current) + len(word) + 1 > chars_per_line:
+            lines.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        lines.append(current)
+
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # 1 catalog, 2 pages, 3 font, then (page, content) pairs
+    objects = {
+        1: "<< /Type /Catalog /Pages 2 0 R >>",
+        3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for i, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * i, 5 + 2 * i
+        kids.append(f"{page_id} 0 R")
+        stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(
+            f"({_pdf_escape(line)}) '" for line in page_lines
+        ) + " ET"
+        objects[page_id] = (
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        )
+        objects[content_id] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n{objects[obj_id]}\nendobj\n".encode("latin-1", "replace")
+
+    xref = len(out)
+    size = max(objects) + 1
+    out += f"xref\n0 {size}\n0000000000 65535 f \n".encode()
+    for obj_id in range(1, size):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode()
+    out += f"trailer << /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def resume_pdfs(n, directory, seed=1):
+    """
+    Writes n resume PDFs into directory; returns their paths
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i, text in enumerate(resume_texts(n, seed=seed)):
+        path = os.path.join(directory, f"resume_{i:05d}.pdf")
+        if not os.path.exists(path):
+            write_text_pdf(path, text)
+        paths.append(path)
+    return paths
@@ -0,0 +1,98 @@
+"""
+PDF text extraction engines: speed and output compared with pdfplumber.
+
+Runs every engine in-process over generated resumes (plus any real
+sample PDFs given with --samples) and reports throughput, how close the
+text is to pdfplumber's, and how much the resulting match scores move.
+
+    python -m benchmarks.pdf_engines --resumes 200 --samples ~/resumes
+"""
+import argparse
+import glob
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks import corpus
+
+
+ENGINES = ["pdfplumber", "pdfium", "auto"]
+
+
+def _timed_extract(engine, paths):
+    from app.ml.pdf_service import PDF_MAX_CHARS, PDF_MAX_PAGES, extract_text_limited
+
+    texts, times = [], []
+    for path in paths:
+        start = time.perf_counter()
+        texts.append(extract_text_limited(path, PDF_MAX_PAGES, PDF_MAX_CHARS, engine))
+        times.append((time.perf_counter() - start) * 1000)
+    return texts, times
+
+
+def _jaccard(a, b):
+    a, b = set(a.lower().split()), set(b.lower().split())
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _fallbacks(paths):
+    from app.ml.pdf_service import PDF_MAX_CHARS, PDF_MAX_PAGES, _pdfium_text, text_problem
+
+    reasons = {}
+    for path in paths:
+        problem = text_problem(*_pdfium_text(path, PDF_MAX_PAGES, PDF_MAX_CHARS))
+        if problem:
+            reasons[problem] = reasons.get(problem, 0) + 1
+    return reasons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resumes", type=int, default=200, help="generated resume PDFs")
+    parser.add_argument("--samples", help="directory of real resume PDFs to include")
+    parser.add_argument("--jobs", type=int, default=200, help="job descriptions for the score comparison")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "pdf-engines-bench"))
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    from app.ml.resume_matcher import calculate_match_scores
+
+    paths = corpus.resume_pdfs(args.resumes, args.workdir, seed=args.seed)
+    if args.samples:
+        paths += sorted(glob.glob(os.path.join(os.path.expanduser(args.samples), "*.pdf")))
+    jobs = [description for _, _, description, _ in corpus.job_descriptions(args.jobs, seed=args.seed)]
+    print(f"{len(paths)} PDFs, scores against {len(jobs)} job descriptions\n")
+
+    results = {engine: _timed_extract(engine, paths) for engine in ENGINES}
+    baseline_texts, baseline_times = results["pdfplumber"]
+    baseline_scores = [calculate_match_scores(text, jobs) for text in baseline_texts]
+
+    print(f"{'engine':<11} {'docs/s':>8} {'median ms':>10} {'p95 ms':>8} {'speedup':>8} "
+          f"{'word jaccard':>13} {'mean |Δscore|':>14} {'max |Δscore|':>13}")
+    for engine in ENGINES:
+        texts, times = results[engine]
+        deltas = np.concatenate([
+            np.abs(calculate_match_scores(text, jobs) - base)
+            for text, base in zip(texts, baseline_scores)
+        ])
+        print(
+            f"{engine:<11} {len(times) / (sum(times) / 1000):>8.1f} "
+            f"{statistics.median(times):>10.2f} {np.percentile(times, 95):>8.2f} "
+            f"{sum(baseline_times) / sum(times):>7.1f}x "
+            f"{statistics.mean(_jaccard(t, b) for t, b in zip(texts, baseline_texts)):>13.3f} "
+            f"{deltas.mean():>14.3f} {deltas.max():>13.2f}"
+        )
+
+    reasons = _fallbacks(paths)
+    fell_back = sum(reasons.values())
+    print(f"\nauto fell back to pdfplumber for {fell_back}/{len(paths)} PDFs"
+          + (f": {reasons}" if reasons else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Benchmark the ML functions on a synthetic corpus.
+
+Each benchmark runs in its own spawned process so peak RSS is per function.
+Results are printed and saved as JSON for benchmarks.compare.
+
+    python -m benchmarks.run --scale 10k
+    python -m benchmarks.run --jobs 5000 --resumes 20 --only recommendations
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from types import SimpleNamespace
+
+import numpy as np
+
+from benchmarks import corpus
+
+
+DEFAULT_OUT = os.path.join(os.path.dirname(__file__), "results")
+
+
+# ===============================
+# BENCHMARK REGISTRY
+# ===============================
+BENCHMARKS = {}
+
+
+def benchmark(name, max_calls=None):
+    """
+    Registers setup(ctx) -> (fn, inputs); fn(input) is what gets timed
+    """
+    def decorator(setup):
+        BENCHMARKS[name] = {"setup": setup, "max_calls": max_calls}
+        return setup
+    return decorator
+
+
+class Context:
+    """
+    Lazily generated corpus shared by the setups of one benchmark run
+    """
+
+    def __init__(self, n_jobs, n_resumes, workdir, seed):
+        self.n_jobs = n_jobs
+        self.n_resumes = n_resumes
+        self.workdir = workdir
+        self.seed = seed
+        self._jobs = None
+        self._pdfs = None
+
+    @property
+    def jobs(self):
+        if self._jobs is None:
+            self._jobs = corpus.job_descriptions(self.n_jobs, seed=self.seed)
+        return self._jobs
+
+    @property
+    def resume_pdfs(self):
+        if self._pdfs is None:
+            self._pdfs = corpus.resume_pdfs(
+                self.n_resumes, os.path.join(self.workdir, "resumes"), seed=self.seed + 1
+            )
+        return self._pdfs
+
+    def job_index(self):
+        from app.ml.job_index import JobIndex
+
+        index = JobIndex()
+        index.build((job_id, description) for job_id, _, description, _ in self.jobs)
+        return index
+
+    def warm_resume_cache(self):
+        from app.ml.resume_text import get_resume_text
+
+        for path in self.resume_pdfs:
+            get_resume_text(path)
+
+
+@benchmark("recommendations")
+def _recommendations(ctx):
+    from app.ml.recommendation_cache import CACHE_TOP_N, MIN_SCORE
+    from app.ml.resume_text import get_resume_text
+
+    index = ctx.job_index()
+    ctx.warm_resume_cache()  # time scoring, not parsing
+
+    def recommend(path):
+        # What a recommendation cache miss computes (recommendation_cache._full)
+        return index.top_matches(get_resume_text(path), CACHE_TOP_N, threshold=MIN_SCORE)
+
+    return recommend, ctx.resume_pdfs
+
+
+@benchmark("calculate_match_score")
+def _calculate_match_score(ctx):
+    from app.ml.resume_matcher import calculate_match_score
+
+    ctx.warm_resume_cache()
+    rng = random.Random(ctx.seed)
+    pairs = [
+        (path, rng.choice(ctx.jobs)[2])
+        for path in ctx.resume_pdfs
+        for _ in range(5)
+    ]
+    return (lambda pair: calculate_match_score(*pair)), pairs
+
+
+@benchmark("dashboard_top_matches")
+def _dashboard_top_matches(ctx):
+    from app.ml.resume_text import get_resume_text
+
+    index = ctx.job_index()
+    ctx.warm_resume_cache()
+    texts = [get_resume_text(path) for path in ctx.resume_pdfs]
+    return (lambda text: index.top_matches(text, 5, threshold=40)), texts
+
+
+@benchmark("find_similar_jobs", max_calls=20)
+def _find_similar_jobs(ctx):
+    from app.ml.similar_jobs import find_similar_jobs
+
+    jobs = [SimpleNamespace(id=j[0], description=j[2]) for j in ctx.jobs]
+    rng = random.Random(ctx.seed)
+    return (lambda job: find_similar_jobs(job, jobs)), rng.sample(jobs, min(20, len(jobs)))
+
+
+@benchmark("similar_to")
+def _similar_to(ctx):
+    index = ctx.job_index()
+    rng = random.Random(ctx.seed)
+    ids = [job[0] for job in rng.sample(ctx.jobs, min(200, len(ctx.jobs)))]
+    return index.similar_to, ids
+
+
+@benchmark("extract_skills")
+def _extract_skills(ctx):
+    from app.ml.skill_extractor import extract_skills
+
+    return extract_skills, [description for _, _, description, _ in ctx.jobs[:2000]]
+
+
+@benchmark("extract_text_from_pdf", max_calls=50)
+def _extract_text_from_pdf(ctx):
+    from app.ml.resume_text import extract_text_from_pdf
+
+    return extract_text_from_pdf, ctx.resume_pdfs
+
+
+# ===============================
+# MEASUREMENT
+# ===============================
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def measure(fn, inputs, calls, warmup=1):
+    for item in inputs[:warmup]:
+        fn(item)
+
+    timings = []
+    start = time.perf_counter()
+    for i in range(calls):
+        t0 = time.perf_counter_ns()
+        fn(inputs[i % len(inputs)])
+        timings.append(time.perf_counter_ns() - t0)
+    wall = time.perf_counter() - start
+
+    ms = np.asarray(timings) / 1e6
+    return {
+        "calls": calls,
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p90_ms": round(float(np.percentile(ms, 90)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "max_ms": round(float(ms.max()), 4),
+        "throughput_per_s": round(calls / wall, 2) if wall else None,
+    }
+
+
+def run_one(name, n_jobs, n_resumes, calls, workdir, seed):
+    """
+    Runs one benchmark in the current process and returns its result dict
+    """
+    import app.ml.resume_text as resume_text
+
+    # Keep the resume-text disk cache out of the repo
+    resume_text.RESUME_TEXT_DIR = os.path.join(workdir, "resume_text")
+    os.makedirs(resume_text.RESUME_TEXT_DIR, exist_ok=True)
+
+    spec = BENCHMARKS[name]
+    ctx = Context(n_jobs, n_resumes, workdir, seed)
+
+    t0 = time.perf_counter()
+    fn, inputs = spec["setup"](ctx)
+    setup_s = time.perf_counter() - t0
+    setup_rss = _peak_rss_mb()
+
+    if spec["max_calls"]:
+        calls = min(calls, spec["max_calls"])
+
+    try:
+        result = measure(fn, list(inputs), calls)
+    finally:
+        # Pool workers are children of this process and would block its exit
+        from app.ml.pdf_service import pdf_service
+        pdf_service.shutdown()
+
+    result.update({
+        "setup_s": round(setup_s, 3),
+        "setup_peak_rss_mb": round(setup_rss, 1),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    })
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", choices=sorted(corpus.SCALES), default="1k",
+                        help="catalog size preset (overridden by --jobs)")
+    parser.add_argument("--jobs", type=int, help="number of synthetic jobs")
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--calls", type=int, default=100, help="timed calls per function")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workdir", help="corpus directory (default: temp dir)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="directory for the JSON result")
+    parser.add_argument("--in-process", action="store_true",
+                        help="skip per-benchmark processes (RSS is then cumulative)")
+    args = parser.parse_args(argv)
+
+    n_jobs = args.jobs or corpus.SCALES[args.scale]
+    names = args.only or list(BENCHMARKS)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="jobfinder-bench-")
+
+    results = {}
+    print(f"{'function':<24} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} "
+          f"{'ops/s':>10} {'peak MB':>9}")
+
+    for name in names:
+        job_args = (name, n_jobs, args.resumes, args.calls, workdir, args.seed)
+        if args.in_process:
+            result = run_one(*job_args)
+        else:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                result = pool.submit(run_one, *job_args).result()
+
+        results[name] = result
+        print(f"{name:<24} {result['p50_ms']:>10.3f} {result['p90_ms']:>10.3f} "
+              f"{result['p99_ms']:>10.3f} {result['throughput_per_s']:>10.1f} "
+              f"{result['peak_rss_mb']:>9.1f}")
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "jobs": n_jobs,
+            "resumes": args.resumes,
+            "calls": args.calls,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    os.makedirs(args.out, exist_ok=True)
+    filename = f"{report['meta']['commit']}-{n_jobs}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    path = os.path.join(args.out, filename)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    main()
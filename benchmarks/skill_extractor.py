@@ -0,0 +1,84 @@
+"""
+Throughput of the skill extractor versus dictionary size.
+
+Compares the old one-regex-per-skill loop with the compiled
+single-pass SkillMatcher on the same synthetic texts.
+
+    python -m benchmarks.skill_extractor --sizes 25 250 1000 5000
+"""
+import argparse
+import random
+import re
+import string
+import time
+
+from app.ml.skill_extractor import SKILL_KEYWORDS, SkillMatcher
+
+
+def _fake_terms(n, rng):
+    terms = set(SKILL_KEYWORDS)
+    while len(terms) < n:
+        words = rng.randint(1, 2)
+        terms.add(" ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9)))
+            for _ in range(words)
+        ))
+    return sorted(terms)
+
+
+def _fake_texts(terms, n_texts, words_per_text, rng):
+    filler = [
+        "experience", "team", "build", "with", "and", "the", "years",
+        "senior", "developer", "strong", "knowledge", "of", "projects",
+    ]
+    texts = []
+    for _ in range(n_texts):
+        words = [
+            rng.choice(terms) if rng.random() < 0.05 else rng.choice(filler)
+            for _ in range(words_per_text)
+        ]
+        texts.append(" ".join(words))
+    return texts
+
+
+def _per_skill_loop(terms):
+    patterns = [(t, re.compile(rf"\b{re.escape(t)}\b")) for t in terms]
+
+    def extract(text):
+        text = text.lower()
+        return sorted({t.title() for t, p in patterns if p.search(text)})
+
+    return extract
+
+
+def _throughput(extract, texts):
+    start = time.perf_counter()
+    for text in texts:
+        extract(text)
+    elapsed = time.perf_counter() - start
+    return len(texts) / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 250, 1000, 5000])
+    parser.add_argument("--texts", type=int, default=200)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+
+    print(f"{'skills':>8} {'loop texts/s':>14} {'matcher texts/s':>16} {'speedup':>8}")
+    for size in args.sizes:
+        terms = _fake_terms(size, rng)
+        texts = _fake_texts(terms, args.texts, args.words, rng)
+
+        loop = _throughput(_per_skill_loop(terms), texts)
+        matcher = _throughput(SkillMatcher(terms).extract, texts)
+
+        print(f"{size:>8} {loop:>14.1f} {matcher:>16.1f} {matcher / loop:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Admin user search at scale: ILIKE + OFFSET versus the indexed path.
+
+Builds a throwaway SQLite database with synthetic users, then times
+users_list-style queries both ways (first page and a deep page).
+
+    python -m benchmarks.user_search --users 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+ROLES = [("job_seeker", 0.9), ("employee", 0.06), ("business", 0.035), ("admin", 0.005)]
+SYLLABLES = ["an", "be", "car", "da", "el", "fa", "gi", "ho", "is", "jo", "ka", "li",
+             "ma", "ne", "ol", "pa", "ri", "sa", "to", "ul", "va", "wi", "xe", "yo", "ze"]
+DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "example.org", "mail.de"]
+
+
+def _word(rng):
+    return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).capitalize()
+
+
+def _users(n, rng):
+    from app.user_search import normalize_email, normalize_name
+
+    roles, weights = zip(*ROLES)
+    for i in range(1, n + 1):
+        first, last = _word(rng), _word(rng)
+        name = f"{first} {last}"
+        email = f"{first.lower()}.{last.lower()}{i}@{rng.choice(DOMAINS)}"
+        yield {
+            "name": name, "email": email, "password_hash": "x",
+            "user_type": rng.choices(roles, weights)[0],
+            "name_normalized": normalize_name(name), "email_normalized": normalize_email(email),
+        }
+
+
+def build(n, rng, chunk=20000):
+    from app import db
+    from app.migrations import upgrade
+    from app.models import User
+    from app.user_search import reindex_users
+
+    upgrade(echo=lambda m: None)
+
+    start = time.perf_counter()
+    rows = _users(n, rng)
+    with db.engine.begin() as conn:
+        while True:
+            batch = [row for _, row in zip(range(chunk), rows)]
+            if not batch:
+                break
+            conn.execute(User.__table__.insert(), batch)
+        reindex_users(conn)
+        conn.exec_driver_sql("ANALYZE")
+    return time.perf_counter() - start
+
+
+def _timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def legacy_page(search, role, page):
+    """
+    The old users_list: ILIKE on both columns, COUNT + OFFSET pagination
+    """
+    from app.models import User
+
+    query = User.query
+    if search:
+        query = query.filter(User.name.ilike(f"%{search}%") | User.email.ilike(f"%{search}%"))
+    if role:
+        query = query.filter_by(user_type=role)
+    return query.paginate(page=page, per_page=10, error_out=False).items
+
+
+def indexed_page(search, role, after_id):
+    from app.models import User
+    from app.user_search import user_search_filter
+
+    query = User.query
+    if search:
+        query = query.filter(user_search_filter(search))
+    if role:
+        query = query.filter_by(user_type=role)
+    if after_id:
+        query = query.filter(User.id > after_id)
+    return query.order_by(User.id).limit(11).all()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--deep-page", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="SQLite file to use (default: a temp file)")
+    args = parser.parse_args(argv)
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix="user-search-"), "users.db")
+    if os.path.exists(path):
+        os.remove(path)
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("CACHE_BACKEND", "null")
+
+    from app import create_app
+
+    app = create_app()
+    rng = random.Random(args.seed)
+
+    cases = [
+        ("all users", None, None),
+        ("role=employee", None, "employee"),
+        ("prefix 'jo'", "jo", None),
+        ("infix 'arika'", "arika", None),
+        ("infix 'gmail' + role", "gmail", "employee"),
+        ("email-ish 'ho.li'", "ho.li", None),
+    ]
+
+    with app.app_context():
+        print(f"Building {args.users} users in {path} ...")
+        print(f"  built in {build(args.users, rng):.1f}s")
+
+        deep_after = args.deep_page * 10
+        print(f"\n{'query':<24} {'legacy p1':>10} {'legacy deep':>12} {'indexed p1':>11} {'indexed deep':>13}  (ms, median)")
+        for label, search, role in cases:
+            timings = [
+                _timed(lambda: legacy_page(search, role, 1), args.repeat),
+                _timed(lambda: legacy_page(search, role, args.deep_page), args.repeat),
+                _timed(lambda: indexed_page(search, role, None), args.repeat),
+                # a keyset cursor lands straight on the deep page
+                _timed(lambda: indexed_page(search, role, deep_after), args.repeat),
+            ]
+            print(f"{label:<24} " + " ".join(f"{t:>{w}.1f}" for t, w in zip(timings, (10, 12, 11, 13))))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 from app import create_app
-from app.models import *
+from app.migrations import upgrade
 
 app = create_app()
 
-with app.app_context():
-    db.create_all()
-
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    # Schema changes ship as migrations (flask --app run db-upgrade)
+    with app.app_context():
+        upgrade()
+
+    app.run(debug=True)